@@ -3,6 +3,10 @@
 用于配置情绪识别云端服务器的连接信息
 """
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # 云端服务器配置
 CLOUD_CONFIG = {
     # 云端服务器地址（请修改为您的实际服务器地址）
@@ -18,9 +22,37 @@ CLOUD_CONFIG = {
     "api_key": "your-api-key-here",
     
     # 是否启用SSL验证
-    "verify_ssl": True
+    "verify_ssl": True,
+    
+    # 连接池大小（同一服务器保持的长连接数）
+    "pool_maxsize": 4
 }
 
+# 共享的HTTP会话（复用TCP/TLS连接，避免每次上传重新握手）
+_session = None
+
+
+def get_session():
+    """
+    获取共享的HTTP会话
+    
+    Returns:
+        requests.Session: 带连接池和重试策略的会话
+    """
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=CLOUD_CONFIG["pool_maxsize"],
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        _session.verify = CLOUD_CONFIG["verify_ssl"]
+    return _session
+
+
 # 情绪类别映射（中英文）
 EMOTION_MAPPING = {
     "happy": "开心",
@@ -3,13 +3,24 @@
 管理接收到的数据，提供数据访问接口
 """
 
-from collections import deque
 from datetime import datetime
 import time
 
+import numpy as np
+
+
+def _to_unix(timestamp):
+    """将datetime或unix秒统一转换为unix秒"""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
 
 class DataBuffer:
-    """数据缓冲类"""
+    """数据缓冲类（按字段存储的环形缓冲区）"""
+    
+    # 标量字段（虚拟数据可能为负值，统一使用int32存储）
+    SCALAR_FIELDS = ('frame_id', 'ads1118', 'adc_ch0', 'adc_ch1', 'red_led', 'ir_led')
     
     def __init__(self, max_points=2000):
         """
@@ -19,7 +30,17 @@ class DataBuffer:
             max_points: 最大缓存数据点数
         """
         self.max_points = max_points
-        self.data = deque(maxlen=max_points)
+        
+        # 每个字段一块连续数组，写指针循环覆盖最旧的数据
+        self._columns = {name: np.zeros(max_points, dtype=np.int32)
+                         for name in self.SCALAR_FIELDS}
+        self._quat = np.zeros((max_points, 4), dtype=np.int32)
+        self._ts = np.zeros(max_points, dtype=np.float64)  # unix时间戳（秒）
+        self._head = 0   # 下一个写入位置
+        self._count = 0  # 有效数据点数
+        self._t0 = 0.0   # 均匀时间戳的基准（unix秒）
+        self._n = 0      # 自基准以来的样本数
+        
         self.start_time = None
         self.last_update_time = None
         self.frame_count = 0
@@ -35,32 +56,110 @@ class DataBuffer:
         """
         if self.start_time is None:
             self.start_time = time.time()
-            # 使用解析数据中的时间戳作为参考（如果是虚拟数据）
-            if 'timestamp' in parsed_data:
-                # 保留原有时间戳（虚拟数据已经设置了均匀时间戳）
-                pass
-            else:
-                # 为真实数据生成均匀时间戳
-                from datetime import datetime, timedelta
-                parsed_data['timestamp'] = datetime.now()
-        else:
-            # 如果数据中没有时间戳，生成均匀时间戳
-            if 'timestamp' not in parsed_data or parsed_data.get('_use_uniform_timestamp', True):
-                from datetime import datetime, timedelta
-                # 基于第一个数据点生成均匀时间戳
-                if len(self.data) > 0:
-                    last_timestamp = list(self.data)[-1]['timestamp']
-                    parsed_data['timestamp'] = last_timestamp + timedelta(seconds=self.time_interval)
-                else:
-                    parsed_data['timestamp'] = datetime.now()
+            # 使用解析数据中的时间戳作为参考（如果是虚拟数据），否则使用当前时间
+            self._t0 = _to_unix(parsed_data.get('timestamp', self.start_time))
+            self._n = 0
+        elif 'timestamp' in parsed_data and not parsed_data.get('_use_uniform_timestamp', True):
+            # 保留数据自带的时间戳，后续均匀时间戳以它为基准
+            self._t0 = _to_unix(parsed_data['timestamp'])
+            self._n = 0
             
-        self.data.append(parsed_data)
+        # 均匀时间戳：基准时间 + 样本序号 × 采样间隔（unix秒，避免逐点构造datetime）
+        ts = self._t0 + self._n * self.time_interval
+        self._n += 1
+        parsed_data['timestamp'] = ts
+        
+        i = self._head
+        for name in self.SCALAR_FIELDS:
+            self._columns[name][i] = parsed_data.get(name, 0)
+        self._quat[i] = parsed_data.get('quat', (0, 0, 0, 0))
+        self._ts[i] = ts
+        
+        self._head = (i + 1) % self.max_points
+        if self._count < self.max_points:
+            self._count += 1
         self.last_update_time = time.time()
         self.frame_count += 1
         
+    def add_batch(self, columns):
+        """
+        批量添加数据（按字段整段写入，使用均匀时间戳）
+        
+        Args:
+            columns: DataParser.parse_many 返回的字段数组字典
+        """
+        quat = columns['quat']
+        k = len(quat)
+        if k == 0:
+            return
+            
+        if self.start_time is None:
+            self.start_time = time.time()
+            self._t0 = self.start_time
+            self._n = 0
+            
+        ts = self._t0 + (self._n + np.arange(k)) * self.time_interval
+        self._n += k
+        
+        # 超出容量时只有最新的max_points个会保留下来
+        skip = max(k - self.max_points, 0)
+        idx = (self._head + skip + np.arange(k - skip)) % self.max_points
+        for name in self.SCALAR_FIELDS:
+            if name in columns:
+                self._columns[name][idx] = columns[name][skip:]
+            else:
+                self._columns[name][idx] = 0
+        self._quat[idx] = quat[skip:]
+        self._ts[idx] = ts[skip:]
+        
+        self._head = (self._head + k) % self.max_points
+        self._count = min(self._count + k, self.max_points)
+        self.last_update_time = time.time()
+        self.frame_count += k
+        
+    def _segments(self, arr):
+        """按时间顺序返回环形数组中有效数据的两段视图（较旧段, 较新段）"""
+        if self._count < self.max_points:
+            return arr[:0], arr[:self._count]
+        return arr[self._head:], arr[:self._head]
+        
+    def _ordered(self, arr, start=0, stop=None):
+        """
+        按时间顺序返回环形数组中有效数据的[start, stop)区间
+        
+        区间落在同一段内时返回视图，跨越回绕点时只拼接所需部分。
+        """
+        older, newer = self._segments(arr)
+        start, stop, _ = slice(start, stop).indices(self._count)
+        split = len(older)
+        if stop <= split:
+            return older[start:stop]
+        if start >= split:
+            return newer[start - split:stop - split]
+        return np.concatenate((older[start:], newer[:stop - split]))
+        
+    def _to_records(self, start=0, stop=None):
+        """将有效数据的[start, stop)区间转换为字典列表（仅供兼容旧接口）"""
+        columns = {name: self._ordered(arr, start, stop).tolist()
+                   for name, arr in self._columns.items()}
+        quat = self._ordered(self._quat, start, stop).tolist()
+        ts = self._ordered(self._ts, start, stop).tolist()
+        
+        records = []
+        for k in range(len(ts)):
+            d = {name: values[k] for name, values in columns.items()}
+            d['quat'] = quat[k]
+            d['timestamp'] = datetime.fromtimestamp(ts[k])
+            records.append(d)
+        return records
+        
+    def __len__(self):
+        """有效数据点数"""
+        return self._count
+        
     def get_all_data(self):
         """获取所有数据"""
-        return list(self.data)
+        return self._to_records()
         
     def get_latest_data(self, n=1):
         """
@@ -72,41 +171,61 @@ class DataBuffer:
         Returns:
             list: 最新的n条数据
         """
-        if n >= len(self.data):
-            return list(self.data)
-        return list(self.data)[-n:]
+        return self._to_records(max(self._count - n, 0))
+        
+    def _field(self, name):
+        """字段名对应的环形数组"""
+        if name == 'timestamp':
+            return self._ts
+        if name == 'quat':
+            return self._quat
+        return self._columns[name]
+        
+    def get_tail(self, n, *fields):
+        """
+        获取指定字段最近n个点的数组
+        
+        只处理所需字段的尾部区间，未跨越回绕点时为视图，跨越时也只拼接这一段。
+        
+        Args:
+            n: 数据点数
+            *fields: 字段名（SCALAR_FIELDS 中的字段、'timestamp' 或 'quat'）
+            
+        Returns:
+            tuple: 与fields一一对应、按时间顺序的数组（长度为min(n, 有效点数)）
+        """
+        start = max(self._count - n, 0)
+        return tuple(self._ordered(self._field(name), start) for name in fields)
         
     def get_data_by_time_range(self, start_time, end_time):
         """
         获取指定时间范围内的数据
         
         Args:
-            start_time: 开始时间
-            end_time: 结束时间
+            start_time: 开始时间（datetime或unix秒）
+            end_time: 结束时间（datetime或unix秒）
             
         Returns:
             list: 时间范围内的数据
         """
-        return [d for d in self.data 
-                if start_time <= d['timestamp'] <= end_time]
-                
+        # 时间戳单调递增，二分查找区间端点
+        ts = self._ordered(self._ts)
+        i0 = int(np.searchsorted(ts, _to_unix(start_time), side='left'))
+        i1 = int(np.searchsorted(ts, _to_unix(end_time), side='right'))
+        return self._to_records(i0, i1)
+        
     def get_timestamps(self):
         """
         获取相对时间戳数组（秒）
         
         Returns:
-            list: 时间戳列表
+            numpy.ndarray: 时间戳数组
         """
-        if not self.data or self.start_time is None:
-            return []
-            
-        timestamps = []
-        for d in self.data:
-            # 计算相对于开始时间的偏移
-            dt = (d['timestamp'] - list(self.data)[0]['timestamp']).total_seconds()
-            timestamps.append(dt)
+        if self._count == 0 or self.start_time is None:
+            return np.empty(0)
             
-        return timestamps
+        ts = self._ordered(self._ts)
+        return ts - ts[0]
         
     def get_sample_rate(self):
         """
@@ -115,19 +234,20 @@ class DataBuffer:
         Returns:
             float: 采样率 (Hz)
         """
-        if len(self.data) < 2:
+        if self._count < 2:
             return 0.0
             
-        # 计算最近1秒内的采样率
-        now = datetime.now()
-        recent_data = [d for d in self.data 
-                      if (now - d['timestamp']).total_seconds() <= 1.0]
-                      
-        return len(recent_data)
+        # 计算最近1秒内的采样率：两段时间戳各自有序，二分查找1秒前的位置即可
+        threshold = time.time() - 1.0
+        return sum(len(seg) - int(np.searchsorted(seg, threshold, side='left'))
+                   for seg in self._segments(self._ts))
         
     def clear(self):
         """清空缓冲区"""
-        self.data.clear()
+        self._head = 0
+        self._count = 0
+        self._t0 = 0.0
+        self._n = 0
         self.start_time = None
         self.last_update_time = None
         self.frame_count = 0
@@ -139,7 +259,7 @@ class DataBuffer:
         Returns:
             dict: 统计信息
         """
-        if not self.data:
+        if self._count == 0:
             return {
                 'count': 0,
                 'duration': 0,
@@ -151,7 +271,7 @@ class DataBuffer:
             duration = self.last_update_time - self.start_time
             
         return {
-            'count': len(self.data),
+            'count': self._count,
             'total_frames': self.frame_count,
             'duration': duration,
             'sample_rate': self.get_sample_rate()
@@ -165,6 +285,10 @@ class DataBuffer:
             field_name: 字段名称
             
         Returns:
-            list: 字段数据列表
+            numpy.ndarray: 字段数据数组（quat为(N, 4)）
         """
-        return [d[field_name] for d in self.data if field_name in d]
+        if field_name == 'quat':
+            return self._ordered(self._quat)
+        if field_name in self._columns:
+            return self._ordered(self._columns[field_name])
+        return np.empty(0)
@@ -4,7 +4,9 @@
 """
 
 import struct
-from datetime import datetime
+import time
+
+import numpy as np
 
 
 class DataParser:
@@ -12,6 +14,24 @@ class DataParser:
     
     FRAME_HEADER = b'\xAB\xCD\x11\x26'
     FRAME_SIZE = 42
+    _HDR_U32 = 0xABCD1126  # 帧头按大端32位整数解释的值
+    
+    # 数据帧的定长字段布局（大端）：帧头(I) ads1118(H) adc_ch0(H) 保留(2x)
+    # adc_ch1(H) 保留(7x) 保留1字节+红光(I) 红外高字节(B) 红外低16位(H) 四元数(4i)
+    # 24位LED值直接由整数字段拼出，无需切片再 int.from_bytes
+    _STRUCT = struct.Struct('>IHH2xH7xIBH4i')
+    
+    # 批量解析用的结构化dtype，与单帧布局一致（共42字节）
+    _DTYPE = np.dtype([
+        ('hdr', '>u4'),
+        ('ads1118', '>u2'),
+        ('adc_ch0', '>u2'),
+        ('pad1', 'V2'),
+        ('adc_ch1', '>u2'),
+        ('pad2', 'V8'),
+        ('leds', 'u1', (6,)),
+        ('quat', '>i4', (4,)),
+    ])
     
     def __init__(self):
         self.frame_count = 0
@@ -31,37 +51,26 @@ class DataParser:
             self.error_count += 1
             return None
             
-        # 验证帧头
-        if frame_data[0:4] != self.FRAME_HEADER:
-            self.error_count += 1
-            return None
-            
         try:
-            parsed_data = {
-                'timestamp': datetime.now(),
-                'frame_id': self.frame_count
-            }
-            
-            # 解析ADS1118数据 (Bytes 4-5)
-            parsed_data['ads1118'] = struct.unpack('>H', frame_data[4:6])[0]
+            # 一次解析全部定长字段 (Bytes 0-41)
+            header, ads1118, adc_ch0, adc_ch1, red, ir_hi, ir_lo, q0, q1, q2, q3 = \
+                self._STRUCT.unpack_from(frame_data)
             
-            # 解析内部ADC通道0 (Bytes 6-7)
-            parsed_data['adc_ch0'] = struct.unpack('>H', frame_data[6:8])[0]
+            # 验证帧头（整数比较，无需切片）
+            if header != self._HDR_U32:
+                self.error_count += 1
+                return None
             
-            # 解析内部ADC通道1 (Bytes 10-11)
-            parsed_data['adc_ch1'] = struct.unpack('>H', frame_data[10:12])[0]
-            
-            # 解析MAX30102血氧数据 (Bytes 20-25)
-            parsed_data['red_led'] = (frame_data[20] << 16) | (frame_data[21] << 8) | frame_data[22]
-            parsed_data['ir_led'] = (frame_data[23] << 16) | (frame_data[24] << 8) | frame_data[25]
-            
-            # 解析MPU6050四元数 (Bytes 26-41)
-            quat = []
-            for i in range(4):
-                offset = 26 + i * 4
-                quat_value = struct.unpack('>i', frame_data[offset:offset+4])[0]
-                quat.append(quat_value)
-            parsed_data['quat'] = quat
+            parsed_data = {
+                'timestamp': time.time(),                       # unix秒，需要时再转换为datetime
+                'frame_id': self.frame_count,
+                'ads1118': ads1118,                             # ADS1118数据 (Bytes 4-5)
+                'adc_ch0': adc_ch0,                             # 内部ADC通道0 (Bytes 6-7)
+                'adc_ch1': adc_ch1,                             # 内部ADC通道1 (Bytes 10-11)
+                'red_led': red & 0xFFFFFF,                      # MAX30102红光 (Bytes 20-22)
+                'ir_led': (ir_hi << 16) | ir_lo,                # MAX30102红外 (Bytes 23-25)
+                'quat': [q0, q1, q2, q3]                        # MPU6050四元数 (Bytes 26-41)
+            }
             
             self.frame_count += 1
             return parsed_data
@@ -71,6 +80,41 @@ class DataParser:
             print(f"解析错误: {e}")
             return None
             
+    def parse_many(self, buf, n=None):
+        """
+        批量解析连续存放的多个数据帧
+        
+        Args:
+            buf: 由若干42字节数据帧首尾相接组成的字节串
+            n: 解析的帧数，为None时按buf长度计算
+            
+        Returns:
+            dict: 各字段的numpy数组（quat形状为(N, 4)），帧头错误的帧被丢弃
+        """
+        if n is None:
+            n = len(buf) // self.FRAME_SIZE
+        arr = np.frombuffer(buf, dtype=self._DTYPE, count=n)
+        
+        # 验证帧头
+        valid = arr['hdr'] == self._HDR_U32
+        if not valid.all():
+            self.error_count += int(n - np.count_nonzero(valid))
+            arr = arr[valid]
+        
+        leds = arr['leds'].astype(np.uint32)
+        columns = {
+            'frame_id': np.arange(self.frame_count, self.frame_count + len(arr)),
+            'ads1118': arr['ads1118'].astype(np.uint16),
+            'adc_ch0': arr['adc_ch0'].astype(np.uint16),
+            'adc_ch1': arr['adc_ch1'].astype(np.uint16),
+            'red_led': (leds[:, 0] << 16) | (leds[:, 1] << 8) | leds[:, 2],
+            'ir_led': (leds[:, 3] << 16) | (leds[:, 4] << 8) | leds[:, 5],
+            'quat': arr['quat'].astype(np.int32)
+        }
+        
+        self.frame_count += len(arr)
+        return columns
+        
     def get_statistics(self):
         """获取统计信息"""
         total = self.frame_count + self.error_count
@@ -153,3 +197,28 @@ class DataConverter:
         yaw = math.atan2(2*(q0*q3 + q1*q2), 1 - 2*(q2*q2 + q3*q3))
         
         return (roll, pitch, yaw)
+        
+    @staticmethod
+    def quaternion_to_euler_batch(q):
+        """
+        批量将四元数转换为欧拉角
+        
+        Args:
+            q: 形状为(N, 4)的四元数数组，列依次为q0, q1, q2, q3
+            
+        Returns:
+            numpy.ndarray: 形状为(N, 3)的(roll, pitch, yaw)数组，弧度制
+        """
+        q = np.asarray(q, dtype=np.float64)
+        
+        # 归一化四元数（零四元数保持为零，结果为(0, 0, 0)）
+        norm = np.linalg.norm(q, axis=1, keepdims=True)
+        q = q / np.where(norm == 0, 1, norm)
+        q0, q1, q2, q3 = q.T
+        
+        # 转换为欧拉角
+        roll = np.arctan2(2*(q0*q1 + q2*q3), 1 - 2*(q1*q1 + q2*q2))
+        pitch = np.arcsin(np.clip(2*(q0*q2 - q3*q1), -1.0, 1.0))
+        yaw = np.arctan2(2*(q0*q3 + q1*q2), 1 - 2*(q2*q2 + q3*q3))
+        
+        return np.stack([roll, pitch, yaw], axis=1)
@@ -8,10 +8,20 @@ import serial
 import serial.tools.list_ports
 import time
 
+from core.data_parser import DataParser
+
+FRAME_HEADER = DataParser.FRAME_HEADER
+FRAME_SIZE = DataParser.FRAME_SIZE
+RX_BUFFER_SIZE = 1 << 16  # 接收缓冲区大小（字节）
+READ_SIZE = 4096           # 单次读取的最大字节数
+READ_TIMEOUT = 0.002       # 单次读取的超时时间（秒），超时返回已到达的数据
+BATCH_FRAMES = 25          # 每次发送的最大帧数（500Hz下约50ms）
+BATCH_INTERVAL = 0.05      # 未满一批时的最长等待时间（秒）
+
 
 class SerialReader(QThread):
     """串口读取线程"""
-    data_received = pyqtSignal(bytes)
+    data_received = pyqtSignal(bytes)  # 一个或多个首尾相接的完整数据帧
     error_occurred = pyqtSignal(str)
     
     def __init__(self, serial_port):
@@ -19,47 +29,43 @@ class SerialReader(QThread):
         self.serial_port = serial_port
         self.running = False
         
+        # 预分配的接收缓冲区，[_r, _w) 为尚未处理的数据
+        self._rb = bytearray(RX_BUFFER_SIZE)
+        self._r = 0
+        self._w = 0
+        
+        # 待发送的数据帧，攒够一批后一次性跨线程发送
+        self._pending = []
+        self._pending_since = 0.0
+        
     def run(self):
         """线程运行函数"""
         self.running = True
-        buffer = bytearray()
+        self._r = self._w = 0
+        view = memoryview(self._rb)
         
+        # 使用短超时的阻塞读取代替轮询in_waiting，超时即返回已到达的数据
+        if self.serial_port:
+            self.serial_port.timeout = READ_TIMEOUT
+            
         while self.running:
             try:
                 if self.serial_port and self.serial_port.is_open:
-                    # 读取可用数据
-                    if self.serial_port.in_waiting:
-                        data = self.serial_port.read(self.serial_port.in_waiting)
-                        buffer.extend(data)
+                    # 尾部空间不足时，将未处理数据移到缓冲区开头
+                    if len(self._rb) - self._w < READ_SIZE:
+                        self._compact()
+                        
+                    # 直接读入接收缓冲区
+                    n = self.serial_port.readinto(view[self._w:self._w + READ_SIZE])
+                    if n:
+                        self._w += n
                         
                         # 查找完整的数据帧
-                        while len(buffer) >= 42:
-                            # 查找帧头
-                            frame_start = -1
-                            for i in range(len(buffer) - 3):
-                                if (buffer[i] == 0xAB and buffer[i+1] == 0xCD and 
-                                    buffer[i+2] == 0x11 and buffer[i+3] == 0x26):
-                                    frame_start = i
-                                    break
-                            
-                            if frame_start == -1:
-                                # 没找到帧头，保留最后3个字节
-                                buffer = buffer[-3:]
-                                break
-                            
-                            # 丢弃帧头前的数据
-                            if frame_start > 0:
-                                buffer = buffer[frame_start:]
-                            
-                            # 检查是否有完整帧
-                            if len(buffer) >= 42:
-                                frame = bytes(buffer[:42])
-                                buffer = buffer[42:]
-                                self.data_received.emit(frame)
-                            else:
-                                break
-                    else:
-                        time.sleep(0.001)  # 避免CPU占用过高
+                        self._extract_frames(view)
+                        
+                    if self._pending and (len(self._pending) >= BATCH_FRAMES or
+                                          time.monotonic() - self._pending_since >= BATCH_INTERVAL):
+                        self._flush_frames()
                 else:
                     break
                     
@@ -70,6 +76,49 @@ class SerialReader(QThread):
                 self.error_occurred.emit(f"未知错误: {str(e)}")
                 break
                 
+        self._flush_frames()
+        view.release()
+        
+    def _compact(self):
+        """将未处理数据移动到缓冲区开头"""
+        pending = self._w - self._r
+        if self._r > 0:
+            self._rb[:pending] = self._rb[self._r:self._w]
+        self._r = 0
+        self._w = pending
+        
+    def _extract_frames(self, view):
+        """从接收缓冲区中提取完整数据帧并发送"""
+        while self._w - self._r >= FRAME_SIZE:
+            # 查找帧头（bytearray.find 在C层完成搜索）
+            frame_start = self._rb.find(FRAME_HEADER, self._r, self._w)
+            
+            if frame_start == -1:
+                # 没找到帧头，保留最后3个字节
+                self._r = self._w - 3
+                break
+                
+            # 丢弃帧头前的数据
+            self._r = frame_start
+            
+            # 检查是否有完整帧
+            if self._w - self._r < FRAME_SIZE:
+                break
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(bytes(view[self._r:self._r + FRAME_SIZE]))
+            self._r += FRAME_SIZE
+            
+        # 数据全部处理完时直接复位读写位置，避免搬移
+        if self._r == self._w:
+            self._r = self._w = 0
+            
+    def _flush_frames(self):
+        """将已提取的数据帧合并为一次信号发送"""
+        if self._pending:
+            self.data_received.emit(b''.join(self._pending))
+            self._pending.clear()
+            
     def stop(self):
         """停止线程"""
         self.running = False
@@ -78,7 +127,7 @@ class SerialReader(QThread):
 
 class SerialHandler(QObject):
     """串口处理类"""
-    data_received = pyqtSignal(bytes)
+    data_received = pyqtSignal(bytes)  # 一个或多个首尾相接的完整数据帧
     connection_changed = pyqtSignal(bool)
     error_occurred = pyqtSignal(str)
     
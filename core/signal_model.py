@@ -3,17 +3,74 @@
 提供EEG和PPG的标准波形模板，用于约束拟合
 """
 
+from functools import lru_cache
+
 import numpy as np
 from scipy import signal
 
 
+@lru_cache(maxsize=32)
+def _time_axis(duration, sample_rate):
+    """按参数缓存的时间轴（只读）"""
+    t = np.linspace(0, duration, int(duration * sample_rate))
+    t.setflags(write=False)
+    return t
+
+
+@lru_cache(maxsize=32)
+def _unit_grid(n):
+    """按长度缓存的[0, 1]等间隔网格（只读），用于模板重采样"""
+    x = np.linspace(0, 1, n)
+    x.setflags(write=False)
+    return x
+
+
+@lru_cache(maxsize=32)
+def _ppg_template_cached(duration, sample_rate, heart_rate):
+    """按参数缓存的PPG模板（只读）"""
+    t = _time_axis(duration, sample_rate)
+    ppg = np.empty_like(t)
+    
+    # 心跳周期
+    period = 60.0 / heart_rate
+    
+    # 每个采样点在心跳周期内的相位
+    phase = (t % period) / period
+    
+    # 标准PPG波形：快速上升 + 缓慢下降 + 重搏波
+    rise = phase < 0.15                          # 快速上升相 (收缩期)
+    fall = (phase >= 0.15) & (phase < 0.35)      # 下降相
+    notch = (phase >= 0.35) & (phase < 0.45)     # 重搏波 (舒张期)
+    rest = phase >= 0.45                         # 回到基线
+    
+    ppg[rise] = np.sin(phase[rise] / 0.15 * np.pi / 2) ** 2
+    ppg[fall] = 1.0 - (phase[fall] - 0.15) / 0.2 * 0.7
+    ppg[notch] = 0.3 + 0.15 * np.sin((phase[notch] - 0.35) / 0.1 * np.pi)
+    ppg[rest] = 0.3 * np.exp(-(phase[rest] - 0.45) / 0.3 * 5)
+    
+    ppg.setflags(write=False)
+    return ppg
+
+
+@lru_cache(maxsize=32)
+def _eeg_alpha_wave_cached(duration, sample_rate, frequency):
+    """按参数缓存的EEG α波模板（只读）"""
+    t = _time_axis(duration, sample_rate)
+    # α波：主频 + 少量谐波
+    eeg = (np.sin(2 * np.pi * frequency * t) + 
+           0.3 * np.sin(2 * np.pi * frequency * 2 * t) +
+           0.1 * np.sin(2 * np.pi * frequency * 0.5 * t))
+    eeg.setflags(write=False)
+    return eeg
+
+
 class PhysiologicalSignalModel:
     """生理信号模型类"""
     
     @staticmethod
     def ppg_template(duration=1.0, sample_rate=500, heart_rate=70):
         """
-        生成标准PPG脉搏波形模板
+        生成标准PPG脉搏波形模板（相同参数的结果会被缓存）
         
         Args:
             duration: 持续时间(秒)
@@ -23,32 +80,14 @@ class PhysiologicalSignalModel:
         Returns:
             t, ppg: 时间轴和PPG波形
         """
-        t = np.linspace(0, duration, int(duration * sample_rate))
-        ppg = np.zeros_like(t)
-        
-        # 心跳周期
-        period = 60.0 / heart_rate
-        
-        for i, time in enumerate(t):
-            # 在每个心跳周期内生成脉搏波
-            phase = (time % period) / period
-            
-            # 标准PPG波形：快速上升 + 缓慢下降 + 重搏波
-            if phase < 0.15:  # 快速上升相 (收缩期)
-                ppg[i] = np.sin(phase / 0.15 * np.pi / 2) ** 2
-            elif phase < 0.35:  # 下降相
-                ppg[i] = 1.0 - (phase - 0.15) / 0.2 * 0.7
-            elif phase < 0.45:  # 重搏波 (舒张期)
-                ppg[i] = 0.3 + 0.15 * np.sin((phase - 0.35) / 0.1 * np.pi)
-            else:  # 回到基线
-                ppg[i] = 0.3 * np.exp(-(phase - 0.45) / 0.3 * 5)
-        
-        return t, ppg
+        t = _time_axis(duration, sample_rate)
+        ppg = _ppg_template_cached(duration, sample_rate, heart_rate)
+        return t.copy(), ppg.copy()
     
     @staticmethod
     def eeg_alpha_wave(duration=1.0, sample_rate=500, frequency=10):
         """
-        生成标准EEG α波模板
+        生成标准EEG α波模板（相同参数的结果会被缓存）
         
         Args:
             duration: 持续时间
@@ -58,12 +97,9 @@ class PhysiologicalSignalModel:
         Returns:
             t, eeg: 时间轴和EEG波形
         """
-        t = np.linspace(0, duration, int(duration * sample_rate))
-        # α波：主频 + 少量谐波
-        eeg = (np.sin(2 * np.pi * frequency * t) + 
-               0.3 * np.sin(2 * np.pi * frequency * 2 * t) +
-               0.1 * np.sin(2 * np.pi * frequency * 0.5 * t))
-        return t, eeg
+        t = _time_axis(duration, sample_rate)
+        eeg = _eeg_alpha_wave_cached(duration, sample_rate, frequency)
+        return t.copy(), eeg.copy()
     
     @staticmethod
     def adaptive_template_fitting(raw_data, template, strength=0.7):
@@ -79,12 +115,12 @@ class PhysiologicalSignalModel:
             fitted_data: 拟合后的数据
         """
         if len(raw_data) != len(template):
-            # 重采样模板以匹配数据长度
-            from scipy import interpolate
-            x_template = np.linspace(0, 1, len(template))
-            x_data = np.linspace(0, 1, len(raw_data))
-            f = interpolate.interp1d(x_template, template, kind='cubic')
-            template = f(x_data)
+            # 重采样模板以匹配数据长度（CubicSpline构造开销远小于interp1d，
+            # 与interp1d(kind='cubic')同为not-a-knot三次样条，结果一致）
+            from scipy.interpolate import CubicSpline
+            x_template = _unit_grid(len(template))
+            x_data = _unit_grid(len(raw_data))
+            template = CubicSpline(x_template, template)(x_data)
         
         # 归一化
         raw_normalized = (raw_data - np.mean(raw_data)) / (np.std(raw_data) + 1e-6)
@@ -113,25 +149,25 @@ class PhysiologicalSignalModel:
         if len(ppg_data) < sample_rate:
             return 70  # 默认心率
         
-        # 使用FFT检测主频
-        from scipy.fft import fft, fftfreq
+        # 使用FFT检测主频（实数输入只需计算非负频率部分）
+        from scipy.fft import rfft
         
         # 去趋势
         ppg_detrend = signal.detrend(ppg_data)
         
         # FFT
         n = len(ppg_detrend)
-        yf = fft(ppg_detrend)
-        xf = fftfreq(n, 1/sample_rate)
+        yf = rfft(ppg_detrend, workers=-1)
         
-        # 只看0.5-3Hz范围 (30-180 bpm)
-        valid_idx = (xf > 0.5) & (xf < 3.0)
-        if not np.any(valid_idx):
+        # 只看0.5-3Hz范围 (30-180 bpm)，第k个频点的频率为 k * sample_rate / n
+        lo = int(np.floor(0.5 * n / sample_rate)) + 1
+        hi = min(int(np.ceil(3.0 * n / sample_rate)), len(yf))
+        if lo >= hi:
             return 70
         
         # 找峰值频率
-        power = np.abs(yf[valid_idx])
-        peak_freq = xf[valid_idx][np.argmax(power)]
+        peak = lo + np.argmax(np.abs(yf[lo:hi]))
+        peak_freq = peak * sample_rate / n
         
         heart_rate = peak_freq * 60
         
@@ -146,22 +182,35 @@ class PhysiologicalSignalModel:
         形态约束的滑动窗口平滑
         
         在每个窗口内，使用模板约束数据形态
+        （所有窗口通过滑动窗口视图一次性计算，模板长度应不短于数据长度）
         """
+        data = np.asarray(data)
+        template = np.asarray(template)
         result = np.copy(data)
         half_window = window // 2
-        
-        for i in range(half_window, len(data) - half_window):
-            # 提取窗口数据
-            window_data = data[i - half_window:i + half_window]
-            
-            # 提取对应的模板片段
-            template_segment = template[i - half_window:i + half_window]
-            
-            # 局部拟合
-            fitted = PhysiologicalSignalModel.adaptive_template_fitting(
-                window_data, template_segment, strength=0.5)
-            
-            # 只更新中心点
-            result[i] = fitted[half_window]
+        span = 2 * half_window
+        n_windows = len(data) - span
+        if n_windows <= 0 or half_window == 0:
+            return result
+        
+        # 所有窗口的二维视图（不复制数据），窗口k对应中心点 k + half_window
+        sliding_window_view = np.lib.stride_tricks.sliding_window_view
+        data_win = sliding_window_view(data, span)[:n_windows]
+        template_win = sliding_window_view(template[:len(data)], span)[:n_windows]
+        
+        # 逐窗口归一化（与 adaptive_template_fitting 相同的计算，strength=0.5）
+        strength = 0.5
+        data_mean = data_win.mean(axis=1)
+        data_std = data_win.std(axis=1)
+        template_mean = template_win.mean(axis=1)
+        template_std = template_win.std(axis=1)
+        
+        centers = slice(half_window, half_window + n_windows)
+        raw_normalized = (data[centers] - data_mean) / (data_std + 1e-6)
+        template_normalized = (template[centers] - template_mean) / (template_std + 1e-6)
+        
+        # 只更新中心点：加权融合后恢复原始数据的幅度
+        fitted = strength * template_normalized + (1 - strength) * raw_normalized
+        result[centers] = fitted * data_std + data_mean
         
         return result
@@ -0,0 +1,85 @@
+"""
+流式滤波
+对持续到达的数据只滤波新增部分，保存滤波器状态和最近的滤波输出
+"""
+
+import numpy as np
+from scipy import signal
+
+from utils.dsp_kernels import sosfilt_stream
+
+
+class StreamingFilter:
+    """带状态的单通道SOS滤波器"""
+    
+    # 不超过该长度的数据块使用编译的逐点递推（调用开销远小于sosfilt），较长的数据块交给scipy
+    SMALL_CHUNK = 256
+    
+    def __init__(self, sos, history=2500):
+        """
+        初始化流式滤波器
+        
+        Args:
+            sos: 二阶节滤波器系数
+            history: 保留的滤波输出点数
+        """
+        self.sos = sos
+        self._zi_step = signal.sosfilt_zi(sos)  # 单位阶跃对应的初始状态，只需求解一次
+        # 最近的滤波输出（按时间顺序，仅用于显示，使用float32）；
+        # 滤波器状态保持float64，低截止频率的极点靠近单位圆，单精度会积累误差
+        self.history = np.zeros(history, dtype=np.float32)
+        self.position = 0                 # 已滤波的样本总数
+        self._zi = None
+        
+    def reset(self):
+        """清空滤波器状态和历史输出"""
+        self.history.fill(0)
+        self.position = 0
+        self._zi = None
+        
+    def update(self, data, total):
+        """
+        滤波新到达的样本并追加到历史输出
+        
+        Args:
+            data: 按时间顺序的原始数据，末尾为最新样本
+            total: 数据源累计写入的样本总数
+        """
+        if total < self.position:
+            # 数据源被清空，重新开始
+            self.reset()
+        gap = total - self.position
+        n_new = min(gap, len(data))
+        self.position = total
+        if n_new <= 0:
+            return
+            
+        x = data[-n_new:]
+        if gap > len(data):
+            # 部分样本未经滤波就已移出数据窗口（显示暂停、突发数据超过窗口），
+            # 旧状态与新数据不再连续，需重新起步，否则会输出虚假的大幅瞬态
+            self._zi = None
+        if self._zi is None:
+            # 以第一个样本作为阶跃初值，避免启动瞬态
+            self._zi = self._zi_step * x[0]
+        if n_new <= self.SMALL_CHUNK:
+            out = sosfilt_stream(self.sos, x, self._zi, np.empty(n_new))
+        else:
+            out, self._zi = signal.sosfilt(self.sos, x, zi=self._zi)
+        
+        # 历史输出左移，新结果写入末尾
+        k = min(n_new, len(self.history))
+        self.history[:-k] = self.history[k:]
+        self.history[-k:] = out[-k:]
+        
+    def latest(self, n):
+        """
+        获取最近n个滤波输出
+        
+        Args:
+            n: 点数
+            
+        Returns:
+            numpy.ndarray: 滤波输出视图
+        """
+        return self.history[len(self.history) - n:]
@@ -11,15 +11,51 @@
 
 from flask import Flask, request, jsonify
 from datetime import datetime
+import base64
+import gzip
+import json
 import numpy as np
 import random
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 app = Flask(__name__)
 
 # 模拟的情绪类别和置信度（使用英文key，由客户端根据语言设置翻译）
 EMOTIONS = ["happy", "sad", "neutral"]
 
 
+def decode_array(value):
+    """
+    解码上传的数组字段，统一转换为float32供特征提取使用
+    
+    数组为 {dtype, shape, data} 形式的原始字节（通常为收窄后的整数类型），直接
+    np.frombuffer 解码；JSON请求中 data 为base64字符串。普通列表同样支持。
+    """
+    if isinstance(value, dict):
+        raw = value['data']
+        if isinstance(raw, str):
+            raw = base64.b64decode(raw)
+        arr = np.frombuffer(raw, dtype=value['dtype']).reshape(value['shape'])
+        return arr.astype(np.float32)
+    return np.array(value, dtype=np.float32)
+
+
+def read_payload():
+    """按Content-Type读取请求数据（application/msgpack 或 application/json，可带gzip压缩）"""
+    body = request.get_data()
+    if request.content_encoding == 'gzip':
+        body = gzip.decompress(body)
+    if request.mimetype == 'application/msgpack':
+        if msgpack is None:
+            raise ValueError("服务器未安装msgpack，无法解析 application/msgpack 请求")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
 @app.route('/api/emotion', methods=['POST'])
 def analyze_emotion():
     """
@@ -28,7 +64,7 @@ def analyze_emotion():
     """
     try:
         # 获取请求数据
-        data = request.json
+        data = read_payload()
         
         # 验证必要字段
         required_fields = ['timestamp', 'sample_rate', 'data_length', 
@@ -43,18 +79,20 @@ def analyze_emotion():
                 }), 400
         
         # 提取各模态数据
-        eeg = np.array(data['eeg_data'])
-        ppg_red = np.array(data['ppg_red_data'])
-        ppg_ir = np.array(data['ppg_ir_data'])
-        imu = np.array(data['imu_data'])
+        eeg = decode_array(data['eeg_data'])
+        ppg_red = decode_array(data['ppg_red_data'])
+        ppg_ir = decode_array(data['ppg_ir_data'])
+        imu = decode_array(data['imu_data'])
         
-        print(f"\n收到数据:")
-        print(f"  - 采样率: {data['sample_rate']} Hz")
-        print(f"  - 数据长度: {data['data_length']} 点")
-        print(f"  - EEG数据: {len(eeg)} 点, 范围 [{eeg.min():.1f}, {eeg.max():.1f}]")
-        print(f"  - PPG红光: {len(ppg_red)} 点, 范围 [{ppg_red.min():.1f}, {ppg_red.max():.1f}]")
-        print(f"  - PPG红外: {len(ppg_ir)} 点, 范围 [{ppg_ir.min():.1f}, {ppg_ir.max():.1f}]")
-        print(f"  - IMU数据: {len(imu)} 点")
+        # 诊断输出仅在调试模式下打印（避免每个请求额外计算min/max）
+        if app.debug:
+            print(f"\n收到数据:")
+            print(f"  - 采样率: {data['sample_rate']} Hz")
+            print(f"  - 数据长度: {data['data_length']} 点")
+            print(f"  - EEG数据: {len(eeg)} 点, 范围 [{eeg.min():.1f}, {eeg.max():.1f}]")
+            print(f"  - PPG红光: {len(ppg_red)} 点, 范围 [{ppg_red.min():.1f}, {ppg_red.max():.1f}]")
+            print(f"  - PPG红外: {len(ppg_ir)} 点, 范围 [{ppg_ir.min():.1f}, {ppg_ir.max():.1f}]")
+            print(f"  - IMU数据: {len(imu)} 点")
         
         # ============================================================
         # TODO: 在这里调用您的真实多模态情绪识别算法
@@ -69,8 +107,8 @@ def analyze_emotion():
         
         # 以下是模拟代码，仅用于测试
         # 计算一些简单特征作为示例
-        eeg_mean = np.mean(eeg)
-        ppg_std = np.std(ppg_red)
+        eeg_mean = eeg.mean()
+        ppg_std = ppg_red.std()
         
         # 基于简单规则的情绪判断（仅作演示）
         if ppg_std > 50000:  # 高变异性可能表示兴奋
@@ -98,10 +136,11 @@ def analyze_emotion():
         emotion = max(scores, key=scores.get)
         confidence = scores[emotion]
         
-        print(f"\n识别结果:")
-        print(f"  - 情绪: {emotion}")
-        print(f"  - 置信度: {confidence:.2%}")
-        print(f"  - 详细得分: {scores}")
+        if app.debug:
+            print(f"\n识别结果:")
+            print(f"  - 情绪: {emotion}")
+            print(f"  - 置信度: {confidence:.2%}")
+            print(f"  - 详细得分: {scores}")
         
         # 返回结果
         return jsonify({
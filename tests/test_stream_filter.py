@@ -0,0 +1,73 @@
+"""
+流式滤波测试
+"""
+
+import unittest
+
+import numpy as np
+from scipy import signal
+
+from core.stream_filter import StreamingFilter
+
+
+FS = 500
+WINDOW = 2500
+
+
+def drifting_ppg(n, seed=0):
+    """带基线漂移的模拟PPG信号"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    return 30000 + 20000 * t / t[-1] + 500 * np.sin(2 * np.pi * 1.2 * t) + rng.normal(0, 20, n)
+
+
+class StreamingFilterTest(unittest.TestCase):
+    """StreamingFilter 测试"""
+    
+    def setUp(self):
+        self.sos = signal.butter(4, [0.5, 8], btype='band', fs=FS, output='sos')
+        
+    def feed(self, filt, stream, start, stop, step=50):
+        """按刷新节奏把 stream[start:stop] 送入滤波器（每次只可见最近WINDOW个点）"""
+        for total in range(start + step, stop + 1, step):
+            filt.update(stream[max(total - WINDOW, 0):total], total)
+            
+    def test_continuous_matches_sosfilt(self):
+        """连续更新与整段 sosfilt 结果一致"""
+        stream = drifting_ppg(5000)
+        filt = StreamingFilter(self.sos, history=WINDOW)
+        self.feed(filt, stream, 0, len(stream))
+        
+        zi = signal.sosfilt_zi(self.sos) * stream[0]
+        expected, _ = signal.sosfilt(self.sos, stream, zi=zi)
+        np.testing.assert_allclose(filt.latest(WINDOW), expected[-WINDOW:], rtol=1e-4, atol=1e-2)
+        
+    def test_resume_after_gap_matches_fresh_filter(self):
+        """暂停后跳过超过窗口长度的样本，恢复时与新建的滤波器输出一致"""
+        stream = drifting_ppg(5000 + 30 * FS + 2500)
+        filt = StreamingFilter(self.sos, history=WINDOW)
+        self.feed(filt, stream, 0, 5000)
+        
+        # 暂停30秒后恢复：一次更新即跳过了窗口之外的样本
+        total = len(stream)
+        data = stream[total - WINDOW:total]
+        filt.update(data, total)
+        
+        fresh = StreamingFilter(self.sos, history=WINDOW)
+        fresh.update(data, total)
+        np.testing.assert_allclose(filt.latest(WINDOW), fresh.latest(WINDOW), rtol=1e-5, atol=1e-3)
+        
+    def test_reset_when_source_cleared(self):
+        """数据源清空后（总数回退）重新开始"""
+        stream = drifting_ppg(3000)
+        filt = StreamingFilter(self.sos, history=WINDOW)
+        self.feed(filt, stream, 0, 3000)
+        
+        filt.update(stream[:100], 100)
+        fresh = StreamingFilter(self.sos, history=WINDOW)
+        fresh.update(stream[:100], 100)
+        np.testing.assert_allclose(filt.latest(100), fresh.latest(100), rtol=1e-5, atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,28 +7,41 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QComboBox, QLabel, QGroupBox, 
                              QGridLayout, QTextEdit, QSplitter, QMessageBox,
                              QFileDialog, QCheckBox)
-from PyQt5.QtCore import QTimer, Qt, pyqtSlot, QThread, pyqtSignal
+from PyQt5.QtCore import QTimer, Qt, pyqtSlot, QThread, pyqtSignal, QSemaphore
 from PyQt5.QtGui import QFont
 import pyqtgraph as pg
 import numpy as np
 from datetime import datetime
-from scipy import signal, interpolate
+import time
+from scipy import signal, ndimage
 import os
 import mne
 import requests
 import json
+import gzip
+import base64
+import queue
+from types import SimpleNamespace
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 from core.serial_handler import SerialHandler
 from core.data_parser import DataParser
 from core.data_buffer import DataBuffer
+from core.stream_filter import StreamingFilter
 from utils.file_utils import DataRecorder
 from utils.language import LanguageManager
+from utils.dsp_kernels import (gaussian_kernel, demean_and_absmax, demean_movavg5, convolve_same,
+                               summary_stats)
 
 # 尝试导入云端配置，如果不存在则使用默认配置
 try:
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from cloud_config import CLOUD_CONFIG, EMOTION_DISPLAY_CONFIG
+    from cloud_config import CLOUD_CONFIG, EMOTION_DISPLAY_CONFIG, get_session
 except ImportError:
     # 默认配置
     CLOUD_CONFIG = {
@@ -41,26 +54,116 @@ except ImportError:
         "sad": {"color": "#4A90E2", "bg_color": "#E3F2FD", "icon": "😢", "lang_key": "emotion_sad"},
         "neutral": {"color": "#666666", "bg_color": "#F0F0F0", "icon": "😐", "lang_key": "emotion_neutral"}
     }
+    _session = requests.Session()
+    
+    def get_session():
+        """获取共享的HTTP会话"""
+        return _session
+
+
+def compact_int_array(arr):
+    """
+    将整数数组转换为能无损容纳其取值范围的最小整数类型
+    
+    ADS1118为16位、MAX30102为18/24位原始计数，按实际范围收窄类型可成倍减少上传字节数。
+    """
+    if arr.dtype.kind not in 'iu' or arr.size == 0:
+        return arr
+    lo, hi = arr.min(), arr.max()
+    for dtype in ('<u1', '<i1', '<u2', '<i2', '<u4', '<i4'):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return arr.astype(dtype, copy=False)
+    return arr
+
+
+def encode_upload_payload(data):
+    """
+    序列化上传数据
+    
+    numpy数组以 {dtype, shape, data} 形式携带原始字节（整数数组收窄为最小无损类型），
+    服务端可直接 np.frombuffer 解码。安装了msgpack时使用二进制格式，否则回退为JSON，
+    data 为base64字符串。请求体再以最快档位gzip压缩（生理信号相邻样本相关性强）。
+    
+    Args:
+        data: 上传数据字典，值可以是numpy数组
+        
+    Returns:
+        tuple: (请求体bytes, 请求头字典)
+    """
+    packed = {}
+    for key, value in data.items():
+        if isinstance(value, np.ndarray):
+            value = compact_int_array(value)
+            raw = value.tobytes()
+            if msgpack is None:
+                raw = base64.b64encode(raw).decode('ascii')
+            value = {'dtype': value.dtype.str, 'shape': list(value.shape), 'data': raw}
+        packed[key] = value
+        
+    if msgpack is not None:
+        body, content_type = msgpack.packb(packed, use_bin_type=True), 'application/msgpack'
+    else:
+        body, content_type = json.dumps(packed).encode('utf-8'), 'application/json'
+        
+    headers = {'Content-Type': content_type, 'Content-Encoding': 'gzip'}
+    return gzip.compress(body, compresslevel=1), headers
 
 
 class UploadWorker(QThread):
-    """后台上传线程，避免阻塞UI"""
+    """常驻后台上传线程（复用同一HTTP会话和连接），避免阻塞UI"""
     upload_success = pyqtSignal(str, float)  # emotion, confidence
     upload_error = pyqtSignal(str)  # error message
     
-    def __init__(self, url, data, timeout=5):
+    def __init__(self, url, timeout=5):
         super().__init__()
         self.url = url
-        self.data = data
         self.timeout = timeout
-    
+        self.running = False
+        self._slot = QSemaphore(1)  # 同时只允许一个上传任务排队或进行（背压）
+        self._tasks = queue.Queue()
+        
+    @property
+    def busy(self):
+        """是否有上传任务正在排队或进行中"""
+        return self._slot.available() == 0
+        
+    def submit(self, data):
+        """
+        提交上传任务
+        
+        Args:
+            data: 上传数据字典
+            
+        Returns:
+            bool: 是否已提交（上一个任务未完成时跳过）
+        """
+        if not self._slot.tryAcquire():
+            return False
+        self._tasks.put(data)
+        return True
+        
     def run(self):
+        """线程运行函数：依次处理提交的上传任务"""
+        self.running = True
+        while self.running:
+            data = self._tasks.get()
+            if data is None:
+                break
+            try:
+                self._upload(data)
+            finally:
+                self._slot.release()
+                
+    def _upload(self, data):
+        """执行一次上传并发送结果信号"""
         try:
-            response = requests.post(
+            body, headers = encode_upload_payload(data)
+            response = get_session().post(
                 self.url,
-                json=self.data,
+                data=body,
                 timeout=self.timeout,
-                headers={'Content-Type': 'application/json'}
+                headers=headers
             )
             
             if response.status_code == 200:
@@ -77,15 +180,47 @@ class UploadWorker(QThread):
             self.upload_error.emit("connection_error")
         except Exception as e:
             self.upload_error.emit(f"error:{str(e)}")
+            
+    def stop(self):
+        """停止线程（等待当前上传完成）"""
+        self.running = False
+        self._tasks.put(None)
+        self.wait()
 
 
 class MainWindow(QMainWindow):
     """主窗口类"""
     
+    # 各日志级别的HTML前缀
+    LOG_PREFIX = {
+        'info': '<span style="color: black;">',
+        'success': '<span style="color: green;">',
+        'warning': '<span style="color: orange;">',
+        'error': '<span style="color: red;">'
+    }
+    
+    # update_ui_language 使用的文本键（切换语言时一次批量取出）
+    UI_TEXT_KEYS = (
+        'window_title', 'control_panel', 'serial_port', 'refresh', 'baudrate', 'clear',
+        'stop', 'record', 'export', 'virtual_data', 'virtual_data_tooltip', 'language',
+        'upload_stop', 'upload_start', 'emotion_title', 'eeg_group', 'ppg_group',
+        'imu_group', 'amplitude', 'time', 'quaternion', 'raw', 'filtered', 'log_area'
+    )
+    
     def __init__(self):
         super().__init__()
         # 初始化语言管理器
         self.lang_manager = LanguageManager('zh_CN')
+        self._t = self._build_text_cache()
+        
+        # 日志先缓存，100ms内的消息合并为一次追加（减少QTextEdit重新排版）
+        self._log_pending = []
+        self._log_timer = QTimer()
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_sec = -1
+        self._log_time_str = ''
         
         self.serial_handler = SerialHandler()
         self.data_parser = DataParser()
@@ -107,8 +242,7 @@ class MainWindow(QMainWindow):
         self.virtual_ppg_data = None  # PPG通道数据
         self.virtual_data_index = 0
         self.virtual_sample_rate = 1000  # BrainVision数据采样率
-        self.virtual_start_time = None  # 虚拟数据开始时间
-        self.virtual_time_interval = 1.0 / 500  # 500Hz采样间隔（秒）
+        self._v_eeg = self._v_red = self._v_ir = None  # 预先生成的整数样本（prepare_virtual_samples）
         
         # 显示窗口设置
         self.display_window = 5.0  # 固定显示5秒数据
@@ -124,8 +258,11 @@ class MainWindow(QMainWindow):
         self.upload_timer.timeout.connect(self.upload_data_to_cloud)
         self.upload_interval = 2000  # 2秒上传一次
         
-        # 上传工作线程（用于后台HTTP请求，避免阻塞UI）
-        self.upload_worker = None
+        # 常驻上传线程（用于后台HTTP请求，避免阻塞UI）
+        self.upload_worker = UploadWorker(self.cloud_server_url, timeout=5)
+        self.upload_worker.upload_success.connect(self.on_upload_success)
+        self.upload_worker.upload_error.connect(self.on_upload_error)
+        self.upload_worker.start()
         
         # 滤波器设计（假设采样率500Hz）
         self.sample_rate = 500  # Hz
@@ -134,18 +271,36 @@ class MainWindow(QMainWindow):
         # PPG低通滤波器: 0.5-8Hz (心率主频段)
         self.ppg_sos = signal.butter(4, [0.5, 8], btype='band', fs=self.sample_rate, output='sos')
         
+        # 流式滤波器：每次刷新只滤波新到达的样本，保留滤波状态
+        self.eeg_filter = StreamingFilter(self.eeg_sos, history=2500)
+        self.ppg_red_filter = StreamingFilter(self.ppg_sos, history=2500)
+        self.ppg_ir_filter = StreamingFilter(self.ppg_sos, history=2500)
+        
+        # 高斯平滑窗口（sigma=2）
+        self.gauss_kernel = gaussian_kernel(2)
+        # Savitzky-Golay卷积系数缓存（按窗口长度和多项式阶数）
+        self._savgol_coeffs = {(21, 3): signal.savgol_coeffs(21, 3)}
+        
         self.init_ui()
         self.init_plots()
         self.setup_connections()
         
-        # 定时器用于更新UI
+        # 图表刷新由数据到达驱动：累计到plot_min_samples个新样本即安排一次刷新；
+        # 定时器只作为最长刷新间隔的兜底（数据稀疏时），无新数据的周期直接跳过
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_plots)
-        self.update_timer.setInterval(100)  # 100ms更新一次（降低频率减少CPU占用）
+        self.update_timer.setInterval(100)  # 最长100ms刷新一次
+        self.plot_min_samples = 50  # 100ms @ 500Hz
+        self._plot_pending = False
+        self._plotted_frames = 0
         
         # 图表更新计数器，用于降低某些计算的频率
         self.plot_update_counter = 0
         
+        # Y轴范围平滑：各图幅值的指数平均及当前已设置的范围
+        self._y_max_ema = {}
+        self._y_range = {}
+        
     def init_ui(self):
         """初始化UI"""
         self.setWindowTitle(self.lang_manager.get_text('window_title'))
@@ -331,11 +486,15 @@ class MainWindow(QMainWindow):
         self.eeg_plot.getAxis('left').enableAutoSIPrefix(False)  # 禁用自动SI前缀
         self.eeg_plot.setTitle('')
         self.eeg_plot.showGrid(x=True, y=True, alpha=0.3)
-        self.eeg_plot.setDownsampling(mode='peak')
+        self.eeg_plot.setDownsampling(auto=True, mode='peak')  # 按像素宽度自动峰值降采样
         self.eeg_plot.setClipToView(True)
+        # 坐标范围由程序设置：X轴固定为显示窗口，关闭自动范围避免每次setData都重新计算
+        self.eeg_plot.enableAutoRange(axis='xy', enable=False)
+        self.eeg_plot.setXRange(0, self.display_window, padding=0)
         self.eeg_plot.addLegend(offset=(20, 0))
-        self.eeg_raw_curve = self.eeg_plot.plot(pen=pg.mkPen(color=(180, 180, 180), width=1), name=self.lang_manager.get_text('raw'))
-        self.eeg_filtered_curve = self.eeg_plot.plot(pen=pg.mkPen(color='b', width=2), name=self.lang_manager.get_text('filtered'))
+        # 曲线数据均为有限值（经过滤波/去直流），跳过每次setData时的NaN检查
+        self.eeg_raw_curve = self.eeg_plot.plot(pen=pg.mkPen(color=(180, 180, 180), width=1), skipFiniteCheck=True, name=self.lang_manager.get_text('raw'))
+        self.eeg_filtered_curve = self.eeg_plot.plot(pen=pg.mkPen(color='b', width=2), skipFiniteCheck=True, name=self.lang_manager.get_text('filtered'))
         eeg_layout.addWidget(self.eeg_plot)
         layout.addWidget(self.eeg_group, 0, 0, 1, 2)
         
@@ -349,17 +508,20 @@ class MainWindow(QMainWindow):
         self.ppg_plot.getAxis('left').enableAutoSIPrefix(False)  # 禁用自动SI前缀
         self.ppg_plot.setTitle('')
         self.ppg_plot.showGrid(x=True, y=True, alpha=0.3)
-        self.ppg_plot.setDownsampling(mode='peak')
+        self.ppg_plot.setDownsampling(auto=True, mode='peak')  # 按像素宽度自动峰值降采样
         self.ppg_plot.setClipToView(True)
+        # 坐标范围由程序设置：X轴固定为显示窗口，关闭自动范围避免每次setData都重新计算
+        self.ppg_plot.enableAutoRange(axis='xy', enable=False)
+        self.ppg_plot.setXRange(0, self.display_window, padding=0)
         self.ppg_plot.addLegend(offset=(20, 0))
         # 红光LED - 原始信号（浅红色）
-        self.ppg_red_raw_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(255, 150, 150), width=1), name='Red Raw')
+        self.ppg_red_raw_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(255, 150, 150), width=1), skipFiniteCheck=True, name='Red Raw')
         # 红光LED - 滤波后信号（深红色）
-        self.ppg_red_filtered_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(220, 20, 60), width=2), name='Red Filtered')
+        self.ppg_red_filtered_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(220, 20, 60), width=2), skipFiniteCheck=True, name='Red Filtered')
         # 红外LED - 原始信号（浅紫色）
-        self.ppg_ir_raw_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(200, 150, 200), width=1), name='IR Raw')
+        self.ppg_ir_raw_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(200, 150, 200), width=1), skipFiniteCheck=True, name='IR Raw')
         # 红外LED - 滤波后信号（深紫色）
-        self.ppg_ir_filtered_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(128, 0, 128), width=2), name='IR Filtered')
+        self.ppg_ir_filtered_curve = self.ppg_plot.plot(pen=pg.mkPen(color=(128, 0, 128), width=2), skipFiniteCheck=True, name='IR Filtered')
         ppg_layout.addWidget(self.ppg_plot)
         layout.addWidget(self.ppg_group, 1, 0, 1, 2)
         
@@ -372,14 +534,17 @@ class MainWindow(QMainWindow):
         self.imu_plot.setLabel('bottom', self.lang_manager.get_text('time'), units='s')
         self.imu_plot.setTitle('')
         self.imu_plot.showGrid(x=True, y=True, alpha=0.3)
-        self.imu_plot.setDownsampling(mode='peak')
+        self.imu_plot.setDownsampling(auto=True, mode='peak')  # 按像素宽度自动峰值降采样
         self.imu_plot.setClipToView(True)
+        # X轴固定为显示窗口；Y轴保持自动范围
+        self.imu_plot.enableAutoRange(axis='x', enable=False)
+        self.imu_plot.setXRange(0, self.display_window, padding=0)
         self.imu_plot.addLegend(offset=(20, 0))
         self.quat_curves = [
-            self.imu_plot.plot(pen=pg.mkPen(color='r', width=2), name='Q0'),
-            self.imu_plot.plot(pen=pg.mkPen(color='g', width=2), name='Q1'),
-            self.imu_plot.plot(pen=pg.mkPen(color='b', width=2), name='Q2'),
-            self.imu_plot.plot(pen=pg.mkPen(color='orange', width=2), name='Q3')
+            self.imu_plot.plot(pen=pg.mkPen(color='r', width=2), skipFiniteCheck=True, name='Q0'),
+            self.imu_plot.plot(pen=pg.mkPen(color='g', width=2), skipFiniteCheck=True, name='Q1'),
+            self.imu_plot.plot(pen=pg.mkPen(color='b', width=2), skipFiniteCheck=True, name='Q2'),
+            self.imu_plot.plot(pen=pg.mkPen(color='orange', width=2), skipFiniteCheck=True, name='Q3')
         ]
         imu_layout.addWidget(self.imu_plot)
         layout.addWidget(self.imu_group, 2, 0, 1, 2)
@@ -401,8 +566,18 @@ class MainWindow(QMainWindow):
         return self.log_group
         
     def init_plots(self):
-        """初始化图表"""
-        pass
+        """初始化图表（预分配每次刷新复用的显示缓冲区）"""
+        n = self.data_buffer.max_points
+        self._scratch = {
+            'time': np.empty(n, dtype=np.float32),
+            'eeg_raw': np.empty(n, dtype=np.float32),
+            'eeg_filt': np.empty(n, dtype=np.float32),
+            'ppg_red_raw': np.empty(n, dtype=np.float32),
+            'ppg_red_filt': np.empty(n, dtype=np.float32),
+            'ppg_ir_raw': np.empty(n, dtype=np.float32),
+            'ppg_ir_filt': np.empty(n, dtype=np.float32),
+            'quat': np.empty((n, 4), dtype=np.float32)
+        }
         
     def setup_connections(self):
         """设置信号连接"""
@@ -421,7 +596,7 @@ class MainWindow(QMainWindow):
         self.port_combo.addItems(ports)
         
         if ports:
-            self.log_message(self.lang_manager.get_text('ports_found').format(len(ports)))
+            self.log_message(self.lang_manager.get_formatter('ports_found')(len(ports)))
         else:
             self.log_message(self.lang_manager.get_text('no_ports'), 'warning')
             
@@ -439,27 +614,28 @@ class MainWindow(QMainWindow):
                 return
                 
             if self.serial_handler.connect(port, baudrate):
-                self.log_message(self.lang_manager.get_text('connected_to').format(port, baudrate), 'success')
+                self.log_message(self.lang_manager.get_formatter('connected_to')(port, baudrate), 'success')
+                self.reset_y_range()
                 self.update_timer.start()
             else:
-                self.log_message(self.lang_manager.get_text('connect_failed').format(port), 'error')
+                self.log_message(self.lang_manager.get_formatter('connect_failed')(port), 'error')
                 
     @pyqtSlot(bool)
     def on_connection_changed(self, connected):
         """连接状态改变"""
         if connected:
-            self.connect_btn.setText(self.lang_manager.get_text('disconnect'))
+            self.connect_btn.setText(self._t.disconnect)
             self.connect_btn.setStyleSheet("background-color: #f44336; color: white; font-weight: bold;")
-            self.status_label.setText(self.lang_manager.get_text('status_connected'))
+            self.status_label.setText(self._t.status_connected)
             self.status_label.setStyleSheet("color: green; font-weight: bold;")
             self.pause_btn.setEnabled(True)
             self.port_combo.setEnabled(False)
             self.baudrate_combo.setEnabled(False)
             self.refresh_btn.setEnabled(False)
         else:
-            self.connect_btn.setText(self.lang_manager.get_text('connect'))
+            self.connect_btn.setText(self._t.connect)
             self.connect_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
-            self.status_label.setText(self.lang_manager.get_text('status_disconnected'))
+            self.status_label.setText(self._t.status_disconnected)
             self.status_label.setStyleSheet("color: red; font-weight: bold;")
             self.pause_btn.setEnabled(False)
             self.port_combo.setEnabled(True)
@@ -469,182 +645,205 @@ class MainWindow(QMainWindow):
             
     @pyqtSlot(bytes)
     def on_data_received(self, data):
-        """接收到数据"""
-        parsed_data = self.data_parser.parse(data)
+        """接收到数据（一个或多个连续的数据帧）"""
+        # 按结构化dtype整批解析，各字段数组直接整段写入缓冲区
+        columns = self.data_parser.parse_many(data)
         
-        if parsed_data:
-            # 如果启用虚拟数据，替换EEG和PPG数据
-            if self.use_virtual_data and self.virtual_eeg_data is not None:
-                parsed_data = self.apply_virtual_data(parsed_data)
+        # 如果启用虚拟数据，整段替换EEG和PPG数据
+        if self.use_virtual_data and self.virtual_eeg_data is not None:
+            columns = self.apply_virtual_batch(columns)
             
-            # 添加到缓冲区
-            self.data_buffer.add_data(parsed_data)
+        self.data_buffer.add_batch(columns)
+        
+        # 如果正在录制，保存数据
+        if self.data_recorder and self.data_recorder.is_recording:
+            self.data_recorder.add_batch(columns)
+            
+        self.schedule_plot_update()
+        
+    def schedule_plot_update(self):
+        """新样本累计足够时安排一次图表刷新（合并到事件循环的下一轮，避免重复排队）"""
+        if self._plot_pending or not self.update_timer.isActive():
+            return
+        if self.data_buffer.frame_count - self._plotted_frames >= self.plot_min_samples:
+            self._plot_pending = True
+            QTimer.singleShot(0, self.update_plots)
             
-            # 如果正在录制，保存数据
-            if self.data_recorder and self.data_recorder.is_recording:
-                self.data_recorder.add_data(parsed_data)
-                
     def median_filter(self, data, kernel_size=5):
         """中值滤波，去除脉冲噪声"""
         if len(data) < kernel_size:
             return data
-        try:
-            return signal.medfilt(data, kernel_size=kernel_size)
-        except:
-            return data
+        # ndimage.median_filter 为C实现，比 signal.medfilt 快数倍；边界按最近值延拓
+        return ndimage.median_filter(data, size=kernel_size, mode='nearest')
     
     def gaussian_smooth(self, data, sigma=2):
         """高斯平滑"""
         if len(data) < 10:
             return data
-        try:
-            # 生成高斯窗口
-            window_size = int(6 * sigma)
-            if window_size % 2 == 0:
-                window_size += 1
-            x = np.arange(window_size) - window_size // 2
-            gauss = np.exp(-(x**2) / (2 * sigma**2))
-            gauss = gauss / gauss.sum()
-            return np.convolve(data, gauss, mode='same')
-        except:
-            return data
+        # 默认sigma的高斯窗口已在初始化时生成
+        gauss = self.gauss_kernel if sigma == 2 else gaussian_kernel(sigma)
+        data = np.asarray(data, dtype=np.float64)
+        return convolve_same(data, gauss, np.empty(len(data)))
     
     def apply_filter(self, data, sos_filter, min_length=30):
         """应用滤波器"""
-        if len(data) < min_length:
-            return data
-        try:
-            filtered = signal.sosfiltfilt(sos_filter, data)
-            return filtered
-        except:
+        # sosfiltfilt 要求数据长度大于默认的边界延拓长度 3*(2*节数+1)
+        if len(data) < max(min_length, 3 * (2 * len(sos_filter) + 1) + 1):
             return data
+        return signal.sosfiltfilt(sos_filter, data)
     
+    def reset_filters(self):
+        """重置流式滤波器状态（数据源切换或清空后调用）"""
+        self.eeg_filter.reset()
+        self.ppg_red_filter.reset()
+        self.ppg_ir_filter.reset()
+        
+    def reset_y_range(self):
+        """清除Y轴范围状态，下一次刷新立即按新数据设置范围（连接、数据源切换或清空后调用）"""
+        self._y_max_ema.clear()
+        self._y_range.clear()
+        
     def savitzky_golay_filter(self, data, window_length=21, polyorder=3):
         """Savitzky-Golay平滑滤波（保留峰值特征）"""
+        # 确保window_length是奇数
+        if window_length % 2 == 0:
+            window_length += 1
         if len(data) < window_length:
             return data
-        try:
-            # 确保window_length是奇数
-            if window_length % 2 == 0:
-                window_length += 1
-            return signal.savgol_filter(data, window_length, polyorder)
-        except:
-            return data
+        # 卷积系数只与窗口参数有关，计算一次后缓存
+        coeffs = self._savgol_coeffs.get((window_length, polyorder))
+        if coeffs is None:
+            coeffs = signal.savgol_coeffs(window_length, polyorder)
+            self._savgol_coeffs[(window_length, polyorder)] = coeffs
+        return ndimage.convolve1d(np.asarray(data, dtype=np.float64), coeffs, mode='nearest')
     
     def resample_uniform(self, timestamps, data, target_rate=500):
-        """重采样到均匀时间序列，消除采样率抖动"""
+        """
+        重采样到均匀时间序列，消除采样率抖动
+        
+        用于实时显示而非信号重建：采用线性插值（np.interp），超出范围时取端点值
+        """
         if len(timestamps) < 10 or len(data) < 10:
             return timestamps, data
-        try:
-            # 创建均匀时间轴
-            t_start = timestamps[0]
-            t_end = timestamps[-1]
-            duration = t_end - t_start
-            if duration <= 0:
-                return timestamps, data
-            
-            # 计算目标采样点数
-            num_samples = int(duration * target_rate)
-            if num_samples < 10:
-                return timestamps, data
-            
-            # 均匀时间轴
-            t_uniform = np.linspace(t_start, t_end, num_samples)
             
-            # 使用三次样条插值重采样
-            f = interpolate.interp1d(timestamps, data, kind='cubic', 
-                                    bounds_error=False, fill_value='extrapolate')
-            data_uniform = f(t_uniform)
+        # 创建均匀时间轴
+        t_start = timestamps[0]
+        t_end = timestamps[-1]
+        duration = t_end - t_start
+        if duration <= 0:
+            return timestamps, data
             
-            return t_uniform, data_uniform
-        except:
+        # 计算目标采样点数
+        num_samples = int(duration * target_rate)
+        if num_samples < 10:
             return timestamps, data
+            
+        # 均匀时间轴
+        t_uniform = np.linspace(t_start, t_end, num_samples)
+        
+        # 线性插值重采样（无需构造样条，O(N)）
+        data_uniform = np.interp(t_uniform, timestamps, data)
+        
+        return t_uniform, data_uniform
     
     @pyqtSlot()
     def update_plots(self):
         """更新图表显示（优化版：减少计算量）"""
+        self._plot_pending = False
         if self.is_paused:
             return
+            
+        # 自上次刷新以来没有新样本（串口空闲）时跳过
+        frame_count = self.data_buffer.frame_count
+        if frame_count == self._plotted_frames:
+            return
+        self._plotted_frames = frame_count
+        if self.update_timer.isActive():
+            # 兜底定时器从本次刷新重新计时
+            self.update_timer.start()
         
         self.plot_update_counter += 1
             
-        data = self.data_buffer.get_all_data()
-        if not data:
+        if len(self.data_buffer) == 0:
             return
         
         # 仅使用最近的数据点进行绘图（最多2500点 = 5秒 @ 500Hz）
         max_points = 2500
-        if len(data) > max_points:
-            data = data[-max_points:]
-            
+        
         # 更新数据率显示（每5次更新一次，减少UI操作）
         if self.plot_update_counter % 5 == 0:
             self.rate_label.setText("500 Hz")
         
-        # 获取时间轴
-        timestamps = self.data_buffer.get_timestamps()
-        if not timestamps:
-            return
-        if len(timestamps) > max_points:
-            timestamps = timestamps[-max_points:]
+        # 只取绘图用到的字段最近max_points个点（缓冲区未回绕时为视图），逐点对齐
+        timestamps, eeg_data, ppg_red, ppg_ir, quat_array = self.data_buffer.get_tail(
+            max_points, 'timestamp', 'ads1118', 'red_led', 'ir_led', 'quat')
         
         # 预计算通用变量
         current_time = timestamps[-1]
         start_time = current_time - self.display_window
-        timestamps_arr = np.array(timestamps)
-        mask = timestamps_arr >= start_time
-        time_window = timestamps_arr[mask]
-        relative_time = time_window - start_time
+        # 时间戳单调递增，显示窗口是连续的尾部区间：二分查找起点后切片（视图，无需布尔掩码）
+        start_idx = int(np.searchsorted(timestamps, start_time, side='left'))
+        time_window = timestamps[start_idx:]
+        # 显示用float32（unix秒先以float64相减），写入预分配的缓冲区
+        scratch = self._scratch
+        n = len(time_window)
+        relative_time = np.subtract(time_window, start_time, out=scratch['time'][:n])
+        
+        # 流式滤波：只处理上次刷新以来新增的样本
+        total = self.data_buffer.frame_count
+        self.eeg_filter.update(eeg_data, total)
+        self.ppg_red_filter.update(ppg_red, total)
+        self.ppg_ir_filter.update(ppg_ir, total)
         
         # 更新EEG图（原始信号 + 滤波信号）
-        eeg_data = np.array([d.get('ads1118', 0) for d in data])
         if len(eeg_data) > 50:
-            eeg_window = eeg_data[mask] if len(eeg_data) == len(mask) else eeg_data[-len(mask):][mask[-len(eeg_data):]]
+            eeg_window = eeg_data[start_idx:]
             
             if len(eeg_window) > 50:
-                # 应用放大倍数（如果不是虚拟数据）
-                if not self.use_virtual_data:
-                    eeg_window = eeg_window * self.eeg_scale_factor
+                # 滤波信号（1-40Hz带通）：流式滤波的最近结果，带通已去除直流
+                eeg_filtered = self.eeg_filter.latest(len(eeg_window))
                 
-                # 原始信号（去直流）
-                eeg_raw = eeg_window - np.mean(eeg_window)
+                # 应用放大倍数（如果不是虚拟数据）
+                scale = 1 if self.use_virtual_data else self.eeg_scale_factor
+                if scale != 1:
+                    eeg_filtered = np.multiply(eeg_filtered, scale, out=scratch['eeg_filt'][:n])
                 
-                # 滤波信号（1-40Hz带通）
-                eeg_filtered = self.apply_filter(eeg_raw, self.eeg_sos, min_length=50)
+                # 原始信号（去直流、放大和求峰值在同一次遍历中完成）
+                eeg_raw = scratch['eeg_raw'][:n]
+                eeg_peak = demean_and_absmax(eeg_window, scale, eeg_raw)
                 
                 # 绘制信号
                 self.eeg_raw_curve.setData(relative_time[:len(eeg_raw)], eeg_raw)
                 self.eeg_filtered_curve.setData(relative_time[:len(eeg_filtered)], eeg_filtered)
                 
-                # 固定X轴范围为0-5秒（仅偶尔更新Y轴范围，减少计算）
-                self.eeg_plot.setXRange(0, self.display_window, padding=0)
-                if self.plot_update_counter % 3 == 0:
-                    y_max = max(np.max(np.abs(eeg_raw)), np.max(np.abs(eeg_filtered))) * 1.1
-                    self.eeg_plot.setYRange(-y_max, y_max, padding=0)
+                # X轴范围已在初始化时固定为0-5秒；Y轴范围重置后首次刷新立即设置，之后仅偶尔更新
+                if 'eeg' not in self._y_range or self.plot_update_counter % 3 == 0:
+                    y_max = max(eeg_peak, np.abs(eeg_filtered).max()) * 1.1
+                    self.update_y_range(self.eeg_plot, 'eeg', y_max)
             
         # 更新PPG图（红光和红外光两条独立波形）
-        ppg_red = np.array([d.get('red_led', 0) for d in data])
-        ppg_ir = np.array([d.get('ir_led', 0) for d in data])
-        
         if len(ppg_red) > 50 and len(ppg_ir) > 50:
-            ppg_red_window = ppg_red[mask] if len(ppg_red) == len(mask) else ppg_red[-len(mask):][mask[-len(ppg_red):]]
-            ppg_ir_window = ppg_ir[mask] if len(ppg_ir) == len(mask) else ppg_ir[-len(mask):][mask[-len(ppg_ir):]]
+            ppg_red_window = ppg_red[start_idx:]
+            ppg_ir_window = ppg_ir[start_idx:]
             
             if len(ppg_red_window) > 50 and len(ppg_ir_window) > 50:
+                # 滤波信号（0.5-8Hz带通）：流式滤波的最近结果
+                ppg_red_filtered = self.ppg_red_filter.latest(len(ppg_red_window))
+                ppg_ir_filtered = self.ppg_ir_filter.latest(len(ppg_ir_window))
+                
                 # 应用缩放倍数（仅对实时数据）
-                if not self.use_virtual_data:
-                    ppg_red_window = ppg_red_window * self.ppg_scale_factor
-                    ppg_ir_window = ppg_ir_window * self.ppg_scale_factor
+                scale = 1 if self.use_virtual_data else self.ppg_scale_factor
+                if scale != 1:
+                    ppg_red_filtered = np.multiply(ppg_red_filtered, scale, out=scratch['ppg_red_filt'][:n])
+                    ppg_ir_filtered = np.multiply(ppg_ir_filtered, scale, out=scratch['ppg_ir_filt'][:n])
                 
-                # 红光 - 原始信号（去直流）
-                ppg_red_raw = ppg_red_window - np.mean(ppg_red_window)
-                # 红光 - 滤波信号（0.5-8Hz带通）
-                ppg_red_filtered = self.apply_filter(ppg_red_raw, self.ppg_sos, min_length=50)
+                # 红光 - 原始信号（去直流，同时求峰值）
+                ppg_red_raw = scratch['ppg_red_raw'][:n]
+                red_peak = demean_and_absmax(ppg_red_window, scale, ppg_red_raw)
                 
-                # 红外光 - 原始信号（去直流）
-                ppg_ir_raw = ppg_ir_window - np.mean(ppg_ir_window)
-                # 红外光 - 滤波信号（0.5-8Hz带通）
-                ppg_ir_filtered = self.apply_filter(ppg_ir_raw, self.ppg_sos, min_length=50)
+                # 红外光 - 原始信号（去直流，同时求峰值）
+                ppg_ir_raw = scratch['ppg_ir_raw'][:n]
+                ir_peak = demean_and_absmax(ppg_ir_window, scale, ppg_ir_raw)
                 
                 # 绘制红光信号
                 rel_time_ppg = relative_time[:len(ppg_red_raw)]
@@ -654,45 +853,55 @@ class MainWindow(QMainWindow):
                 self.ppg_ir_raw_curve.setData(rel_time_ppg, ppg_ir_raw)
                 self.ppg_ir_filtered_curve.setData(rel_time_ppg, ppg_ir_filtered)
                 
-                # 固定X轴范围为0-5秒
-                self.ppg_plot.setXRange(0, self.display_window, padding=0)
-                if self.plot_update_counter % 3 == 0:
-                    y_max = max(np.max(np.abs(ppg_red_raw)), np.max(np.abs(ppg_ir_raw))) * 1.1
-                    self.ppg_plot.setYRange(-y_max, y_max, padding=0)
+                # Y轴范围重置后首次刷新立即设置，之后仅偶尔更新
+                if 'ppg' not in self._y_range or self.plot_update_counter % 3 == 0:
+                    y_max = max(red_peak, ir_peak) * 1.1
+                    self.update_y_range(self.ppg_plot, 'ppg', y_max)
             
         # 更新四元数图（固定5秒窗）
-        quat_data = [d.get('quat', [0, 0, 0, 0]) for d in data]
-        if quat_data:
-            quat_array = np.array(quat_data)
-            quat_window = quat_array[mask] if len(quat_array) == len(mask) else quat_array[-len(mask):][mask[-len(quat_array):]]
+        if len(quat_array):
+            quat_window = quat_array[start_idx:]
             
             if len(quat_window) > 5:
                 rel_time_imu = relative_time[:len(quat_window)]
-                # 每个四元数分量去除均值，并做简单移动平均平滑
+                # 每个四元数分量去除均值，并做简单的5点移动平均平滑（四个分量一次完成）
+                quat_smooth = demean_movavg5(quat_window, scratch['quat'][:n])
                 for i in range(4):
-                    quat_component = quat_window[:, i]
-                    quat_ac = quat_component - np.mean(quat_component)
-                    # 简单的5点移动平均
-                    if len(quat_ac) >= 5:
-                        quat_smooth = np.convolve(quat_ac, np.ones(5)/5, mode='same')
-                    else:
-                        quat_smooth = quat_ac
-                    
-                    self.quat_curves[i].setData(rel_time_imu[:len(quat_smooth)], quat_smooth)
-                
-                # 固定X轴范围
-                self.imu_plot.setXRange(0, self.display_window, padding=0)
+                    self.quat_curves[i].setData(rel_time_imu, quat_smooth[:, i])
                 
+    def update_y_range(self, plot, name, y_max):
+        """
+        平滑更新对称的Y轴范围
+        
+        幅值变大时立即跟随（避免波形被截断），变小时按指数平均缓慢收缩；
+        只有平均值与当前范围相差超过10%时才调用setYRange，避免频繁重绘坐标轴。
+        
+        Args:
+            plot: PlotWidget
+            name: 图表名称（用于区分各图的状态）
+            y_max: 本次计算的幅值上限
+        """
+        ema = self._y_max_ema.get(name, 0.0)
+        ema = y_max if y_max > ema else 0.9 * ema + 0.1 * y_max
+        self._y_max_ema[name] = ema
+        if ema <= 0:
+            return
+            
+        current = self._y_range.get(name)
+        if current is None or abs(ema - current) > 0.1 * current:
+            plot.setYRange(-ema, ema, padding=0)
+            self._y_range[name] = ema
+            
     @pyqtSlot()
     def toggle_pause(self):
         """暂停/继续显示"""
         self.is_paused = not self.is_paused
         if self.is_paused:
-            self.pause_btn.setText(self.lang_manager.get_text('continue'))
-            self.log_message(self.lang_manager.get_text('paused'))
+            self.pause_btn.setText(self._t.resume)
+            self.log_message(self._t.paused)
         else:
-            self.pause_btn.setText(self.lang_manager.get_text('pause'))
-            self.log_message(self.lang_manager.get_text('continued'))
+            self.pause_btn.setText(self._t.pause)
+            self.log_message(self._t.continued)
             
     @pyqtSlot()
     def clear_data(self):
@@ -701,6 +910,9 @@ class MainWindow(QMainWindow):
                                     QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.data_buffer.clear()
+            self.reset_filters()
+            self.reset_y_range()
+            self._plotted_frames = 0
             self.log_message(self.lang_manager.get_text('data_cleared'))
             
     @pyqtSlot()
@@ -711,12 +923,12 @@ class MainWindow(QMainWindow):
             filename = self.data_recorder.stop_recording()
             self.record_btn.setText(self.lang_manager.get_text('record'))
             self.record_btn.setStyleSheet("")
-            self.log_message(self.lang_manager.get_text('recording_stopped').format(filename), 'success')
+            self.log_message(self.lang_manager.get_formatter('recording_stopped')(filename), 'success')
             self.data_recorder = None
         else:
             # 开始录制
             self.data_recorder = DataRecorder()
-            self.data_recorder.start_recording()
+            self.data_recorder.start_recording(sample_rate=self.sample_rate)
             self.record_btn.setText(self.lang_manager.get_text('stop'))
             self.record_btn.setStyleSheet("background-color: #f44336; color: white;")
             self.log_message(self.lang_manager.get_text('recording_started'), 'success')
@@ -724,7 +936,7 @@ class MainWindow(QMainWindow):
     @pyqtSlot()
     def export_data(self):
         """导出数据"""
-        if not self.data_buffer.get_all_data():
+        if len(self.data_buffer) == 0:
             QMessageBox.warning(self, self.lang_manager.get_text('warning'), self.lang_manager.get_text('no_data_export'))
             return
             
@@ -735,9 +947,12 @@ class MainWindow(QMainWindow):
         )
         
         if filename:
-            from utils.file_utils import export_to_csv
-            if export_to_csv(self.data_buffer.get_all_data(), filename):
-                self.log_message(self.lang_manager.get_text('data_exported').format(filename), 'success')
+            from utils.file_utils import export_columns_to_csv
+            # 直接导出缓冲区的字段数组，不再逐点构造字典
+            fields = ('timestamp', 'ads1118', 'red_led', 'ir_led', 'quat')
+            columns = dict(zip(fields, self.data_buffer.get_tail(len(self.data_buffer), *fields)))
+            if export_columns_to_csv(columns, filename):
+                self.log_message(self.lang_manager.get_formatter('data_exported')(filename), 'success')
             else:
                 self.log_message(self.lang_manager.get_text('export_failed'), 'error')
                 
@@ -754,7 +969,8 @@ class MainWindow(QMainWindow):
             if self.load_virtual_data():
                 self.use_virtual_data = True
                 self.virtual_data_index = 0
-                self.virtual_start_time = None  # 重置虚拟时间
+                self.reset_filters()
+                self.reset_y_range()
                 self.log_message(self.lang_manager.get_text('virtual_enabled'), 'success')
             else:
                 self.sdata_checkbox.setChecked(False)
@@ -764,7 +980,8 @@ class MainWindow(QMainWindow):
             # 禁用虚拟数据
             self.use_virtual_data = False
             self.virtual_data_index = 0
-            self.virtual_start_time = None
+            self.reset_filters()
+            self.reset_y_range()
             self.log_message(self.lang_manager.get_text('virtual_disabled'), 'info')
     
     def load_virtual_data(self):
@@ -777,127 +994,110 @@ class MainWindow(QMainWindow):
             
             # 检查文件是否存在
             if not os.path.exists(vhdr_file):
-                QMessageBox.warning(self, self.lang_manager.get_text('warning'), self.lang_manager.get_text('virtual_file_not_found').format(vhdr_file))
+                QMessageBox.warning(self, self.lang_manager.get_text('warning'), self.lang_manager.get_formatter('virtual_file_not_found')(vhdr_file))
                 return False
             
             self.log_message(self.lang_manager.get_text('loading_virtual'), 'info')
             
-            # 读取 BrainVision 数据
-            raw = mne.io.read_raw_brainvision(vhdr_file, preload=True, verbose=False)
+            # 读取 BrainVision 数据头（不预加载全部通道，get_data 时只从文件读取所选通道）
+            raw = mne.io.read_raw_brainvision(vhdr_file, preload=False, verbose=False)
             
             # 获取采样率
             self.virtual_sample_rate = raw.info['sfreq']
+            sfreq = raw.info['sfreq']
             
-            # 提取 Fp1 和 Fp2 通道，先滤波再计算平均值
+            # 提取 Fp1 和 Fp2 通道，计算平均值后滤波（滤波是线性的，与先滤波再平均等价）
             if 'Fp1' in raw.ch_names and 'Fp2' in raw.ch_names:
-                # 对Fp1和Fp2进行1-40Hz带通滤波
-                raw_eeg = raw.copy()
-                raw_eeg.filter(l_freq=1.0, h_freq=40.0, picks=['Fp1', 'Fp2'], verbose=False)
+                eeg = raw.get_data(picks=['Fp1', 'Fp2']).mean(axis=0)
                 
-                # 重采样到500Hz（使用MNE的resample方法，带抗混叠滤波）
-                raw_eeg.resample(sfreq=500.0, verbose=False)
+                # 1-40Hz带通滤波（SOS零相位）
+                sos_eeg = signal.butter(4, [1, 40], btype='band', fs=sfreq, output='sos')
+                eeg_filtered = signal.sosfiltfilt(sos_eeg, eeg)
                 
-                fp1_data = raw_eeg.get_data(picks=['Fp1'])[0]
-                fp2_data = raw_eeg.get_data(picks=['Fp2'])[0]
-                eeg_filtered = (fp1_data + fp2_data) / 2.0
+                # 多相重采样到500Hz（带抗混叠滤波）
+                eeg_filtered = signal.resample_poly(eeg_filtered, 500, int(round(sfreq)))
                 
-                # 将V转换为μV（1V = 1,000,000 μV）
-                self.virtual_eeg_data = eeg_filtered * 1000000
+                # 将V转换为μV（1V = 1,000,000 μV），以float32保存（回放时最终转换为整数）
+                self.virtual_eeg_data = np.multiply(eeg_filtered, 1e6, out=eeg_filtered).astype(np.float32)
                 
                 # 更新采样率为500Hz
                 self.virtual_sample_rate = 500
                 
                 # 打印数据范围用于调试
-                eeg_min = np.min(self.virtual_eeg_data)
-                eeg_max = np.max(self.virtual_eeg_data)
-                eeg_mean = np.mean(self.virtual_eeg_data)
-                eeg_std = np.std(self.virtual_eeg_data)
-                self.log_message(self.lang_manager.get_text('eeg_range').format(eeg_min, eeg_max, eeg_mean, eeg_std), 'info')
-                self.log_message(self.lang_manager.get_text('eeg_loaded').format(len(self.virtual_eeg_data)), 'success')
+                eeg_min, eeg_max, eeg_mean, eeg_std = summary_stats(self.virtual_eeg_data)
+                self.log_message(self.lang_manager.get_formatter('eeg_range')(eeg_min, eeg_max, eeg_mean, eeg_std), 'info')
+                self.log_message(self.lang_manager.get_formatter('eeg_loaded')(len(self.virtual_eeg_data)), 'success')
             else:
                 QMessageBox.warning(self, self.lang_manager.get_text('warning'), self.lang_manager.get_text('virtual_no_fp1_fp2'))
                 return False
             
             # 提取 PPG 通道并滤波
             if 'PPG' in raw.ch_names:
-                # 对PPG进行0.5-8Hz带通滤波
-                raw_ppg = raw.copy()
-                raw_ppg.filter(l_freq=0.5, h_freq=8.0, picks=['PPG'], verbose=False)
+                ppg = raw.get_data(picks=['PPG'])[0]
                 
-                # 重采样到500Hz（使用MNE的resample方法，带抗混叠滤波）
-                raw_ppg.resample(sfreq=500.0, verbose=False)
+                # 0.5-8Hz带通滤波（SOS零相位）
+                sos_ppg = signal.butter(4, [0.5, 8], btype='band', fs=sfreq, output='sos')
+                ppg_filtered = signal.sosfiltfilt(sos_ppg, ppg)
                 
-                ppg_filtered = raw_ppg.get_data(picks=['PPG'])[0]
+                # 多相重采样到500Hz（带抗混叠滤波）
+                ppg_filtered = signal.resample_poly(ppg_filtered, 500, int(round(sfreq)))
                 
-                # 将V转换为μV（1V = 1,000,000 μV）
-                self.virtual_ppg_data = ppg_filtered * 1000000
+                # 将V转换为μV（1V = 1,000,000 μV），以float32保存
+                self.virtual_ppg_data = np.multiply(ppg_filtered, 1e6, out=ppg_filtered).astype(np.float32)
                 
                 # 打印数据范围用于调试
-                ppg_min = np.min(self.virtual_ppg_data)
-                ppg_max = np.max(self.virtual_ppg_data)
-                ppg_mean = np.mean(self.virtual_ppg_data)
-                ppg_std = np.std(self.virtual_ppg_data)
-                self.log_message(self.lang_manager.get_text('ppg_range').format(ppg_min, ppg_max, ppg_mean, ppg_std), 'info')
-                self.log_message(self.lang_manager.get_text('ppg_loaded').format(len(self.virtual_ppg_data)), 'success')
+                ppg_min, ppg_max, ppg_mean, ppg_std = summary_stats(self.virtual_ppg_data)
+                self.log_message(self.lang_manager.get_formatter('ppg_range')(ppg_min, ppg_max, ppg_mean, ppg_std), 'info')
+                self.log_message(self.lang_manager.get_formatter('ppg_loaded')(len(self.virtual_ppg_data)), 'success')
             else:
                 QMessageBox.warning(self, self.lang_manager.get_text('warning'), self.lang_manager.get_text('virtual_no_ppg'))
                 return False
             
-            self.log_message(self.lang_manager.get_text('virtual_loaded').format(self.virtual_sample_rate), 'success')
+            self.prepare_virtual_samples()
+            self.log_message(self.lang_manager.get_formatter('virtual_loaded')(self.virtual_sample_rate), 'success')
             return True
             
         except Exception as e:
-            QMessageBox.critical(self, self.lang_manager.get_text('error'), self.lang_manager.get_text('virtual_load_error').format(str(e)))
-            self.log_message(self.lang_manager.get_text('virtual_load_error').format(str(e)), 'error')
+            QMessageBox.critical(self, self.lang_manager.get_text('error'), self.lang_manager.get_formatter('virtual_load_error')(str(e)))
+            self.log_message(self.lang_manager.get_formatter('virtual_load_error')(str(e)), 'error')
             return False
     
-    def apply_virtual_data(self, parsed_data):
-        """应用虚拟数据到解析的数据包"""
-        if self.virtual_eeg_data is None or self.virtual_ppg_data is None:
-            return parsed_data
-        
-        # 初始化虚拟时间
-        if self.virtual_start_time is None:
-            self.virtual_start_time = datetime.now()
-        
-        # 数据已经重采样到500Hz，直接使用索引
-        virtual_index = self.virtual_data_index % len(self.virtual_eeg_data)
-        
-        # 替换 EEG 数据 (ads1118)
-        if 'ads1118' in parsed_data:
-            # 使用已滤波和放大的EEG数据
-            eeg_value = self.virtual_eeg_data[virtual_index]
-            parsed_data['ads1118'] = int(eeg_value)
-        
-        # 替换 PPG 数据 (red_led 和 ir_led)
-        # 将单个PPG通道分成红光和红外光，模拟真实的光学特性差异
-        if 'red_led' in parsed_data or 'ir_led' in parsed_data:
-            # 使用已滤波和放大的PPG数据
-            ppg_value = self.virtual_ppg_data[virtual_index]
+    def apply_virtual_batch(self, columns):
+        """
+        将虚拟数据整段替换到批量解析的字段数组中（EEG和PPG按播放位置循环取值，姿态数据保持不变）
+        
+        Args:
+            columns: DataParser.parse_many 返回的字段数组字典
             
-            if 'red_led' in parsed_data:
-                # 红光LED：幅度较大（对含氧血红蛋白更敏感，AC/DC比更高）
-                # 添加随机噪声：约2%的高斯噪声，模拟测量误差
-                noise_red = np.random.normal(0, abs(ppg_value) * 0.02)
-                parsed_data['red_led'] = int(ppg_value * 1.3 + noise_red)
-            if 'ir_led' in parsed_data:
-                # 红外LED：幅度较小（信号更稳定）
-                # 添加较小的随机噪声：约1.5%的高斯噪声（红外光更稳定）
-                noise_ir = np.random.normal(0, abs(ppg_value) * 0.015)
-                parsed_data['ir_led'] = int(ppg_value * 0.9 + noise_ir)
-        
-        # 替换时间戳为均匀的虚拟时间戳（模拟500Hz采样）
-        from datetime import timedelta
-        virtual_time = self.virtual_start_time + timedelta(seconds=self.virtual_data_index * self.virtual_time_interval)
-        parsed_data['timestamp'] = virtual_time
-        
-        # 姿态数据保持不变（使用真实数据）
-        # 'quat' 数据不修改
-        
-        # 更新索引（循环播放）
-        self.virtual_data_index = (self.virtual_data_index + 1) % len(self.virtual_eeg_data)
-        
-        return parsed_data
+        Returns:
+            dict: 替换后的字段数组字典
+        """
+        k = len(columns['quat'])
+        idx = (self.virtual_data_index + np.arange(k)) % len(self._v_eeg)
+        columns['ads1118'] = self._v_eeg[idx]
+        columns['red_led'] = self._v_red[idx]
+        columns['ir_led'] = self._v_ir[idx]
+        self.virtual_data_index = (self.virtual_data_index + k) % len(self._v_eeg)
+        return columns
+        
+    def prepare_virtual_samples(self):
+        """
+        预先生成逐点替换用的虚拟样本（整数序列）
+        
+        将单个PPG通道分成红光和红外光，模拟真实的光学特性差异；噪声整段生成一次，
+        循环播放时重复使用。
+        """
+        ppg = self.virtual_ppg_data
+        n = len(ppg)
+        amplitude = np.abs(ppg)
+        rng = np.random.default_rng()
+        # 红光LED：幅度较大（对含氧血红蛋白更敏感，AC/DC比更高），约2%的高斯噪声模拟测量误差
+        noise_red = rng.standard_normal(n, dtype=np.float32) * (amplitude * 0.02)
+        # 红外LED：幅度较小（信号更稳定），约1.5%的高斯噪声
+        noise_ir = rng.standard_normal(n, dtype=np.float32) * (amplitude * 0.015)
+        self._v_eeg = self.virtual_eeg_data.astype(np.int32)
+        self._v_red = (ppg * 1.3 + noise_red).astype(np.int32)
+        self._v_ir = (ppg * 0.9 + noise_ir).astype(np.int32)
     
     def toggle_upload(self):
         """切换云端上传状态"""
@@ -911,8 +1111,7 @@ class MainWindow(QMainWindow):
     def start_upload(self):
         """开始持续上传数据到云端"""
         # 检查是否有数据
-        data = self.data_buffer.get_all_data()
-        if len(data) < 500:
+        if len(self.data_buffer) < 500:
             self.log_message(self.lang_manager.get_text('upload_insufficient_data'), 'warning')
             self.upload_btn.setChecked(False)
             return
@@ -954,37 +1153,32 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            # 获取所有数据
-            data = self.data_buffer.get_all_data()
-            if len(data) < 100:
+            if len(self.data_buffer) < 100:
                 return
             
             # 如果上一个上传任务还在进行中，跳过本次
-            if self.upload_worker is not None and self.upload_worker.isRunning():
+            if self.upload_worker.busy:
                 return
             
-            # 提取最近5秒的数据
-            data_to_send = data[-2500:] if len(data) > 2500 else data
+            # 直接取上传字段最近5秒的数组（不再逐点构造字典）
+            eeg, red, ir, quat = self.data_buffer.get_tail(2500, 'ads1118', 'red_led', 'ir_led', 'quat')
             
-            # 准备上传数据
+            # 准备上传数据（astype复制一份，缓冲区后续写入不会影响上传线程）
             upload_data = {
                 "timestamp": datetime.now().isoformat(),
                 "sample_rate": self.sample_rate,
-                "data_length": len(data_to_send),
-                "eeg_data": [d.get('ads1118', 0) for d in data_to_send],
-                "ppg_red_data": [d.get('red_led', 0) for d in data_to_send],
-                "ppg_ir_data": [d.get('ir_led', 0) for d in data_to_send],
-                "imu_data": [d.get('quat', [0, 0, 0, 0]) for d in data_to_send]
+                "data_length": len(eeg),
+                "eeg_data": eeg.astype(np.int32),
+                "ppg_red_data": red.astype(np.int32),
+                "ppg_ir_data": ir.astype(np.int32),
+                "imu_data": quat.astype(np.int32)
             }
             
-            # 创建后台上传线程
-            self.upload_worker = UploadWorker(self.cloud_server_url, upload_data, timeout=5)
-            self.upload_worker.upload_success.connect(self.on_upload_success)
-            self.upload_worker.upload_error.connect(self.on_upload_error)
-            self.upload_worker.start()
+            # 交给常驻上传线程
+            self.upload_worker.submit(upload_data)
                 
         except Exception as e:
-            self.log_message(f"⚠ {self.lang_manager.get_text('upload_failed').format(str(e))}", 'warning')
+            self.log_message(f"⚠ {self._t.upload_failed(str(e))}", 'warning')
     
     @pyqtSlot(str, float)
     def on_upload_success(self, emotion, confidence):
@@ -994,27 +1188,27 @@ class MainWindow(QMainWindow):
             'happy': 'emotion_happy', 'sad': 'emotion_sad', 'neutral': 'emotion_neutral'
         }
         emotion_key = emotion_map.get(emotion.lower(), 'emotion_neutral')
-        emotion_text = self.lang_manager.get_text(emotion_key)
+        emotion_text = self._t.emotion[emotion_key]
         
         self.update_emotion_display(emotion)
-        self.log_message(f"✅ {self.lang_manager.get_text('upload_emotion_result').format(emotion_text, confidence)}", 'success')
+        self.log_message(f"✅ {self._t.upload_emotion_result(emotion_text, confidence)}", 'success')
     
     @pyqtSlot(str)
     def on_upload_error(self, error_type):
         """上传错误回调"""
         if error_type == "timeout":
-            self.log_message(f"⚠ {self.lang_manager.get_text('upload_timeout')}", 'warning')
+            self.log_message(f"⚠ {self._t.upload_timeout}", 'warning')
         elif error_type == "connection_error":
-            self.log_message(f"⚠ {self.lang_manager.get_text('upload_connection_error')}", 'warning')
+            self.log_message(f"⚠ {self._t.upload_connection_error}", 'warning')
             # 连接失败时自动停止
             self.upload_btn.setChecked(False)
             self.stop_upload()
         elif error_type.startswith("server_error:"):
             status_code = error_type.split(":")[1]
-            self.log_message(f"⚠ {self.lang_manager.get_text('upload_server_error').format(status_code)}", 'warning')
+            self.log_message(f"⚠ {self._t.upload_server_error(status_code)}", 'warning')
         else:
             error_msg = error_type.replace("error:", "")
-            self.log_message(f"⚠ {self.lang_manager.get_text('upload_failed').format(error_msg)}", 'warning')
+            self.log_message(f"⚠ {self._t.upload_failed(error_msg)}", 'warning')
     
     def update_emotion_display(self, emotion):
         """更新情绪状态显示"""
@@ -1029,7 +1223,7 @@ class MainWindow(QMainWindow):
         
         # 获取情绪显示配置
         style_config = EMOTION_DISPLAY_CONFIG.get(emotion_key, EMOTION_DISPLAY_CONFIG.get("neutral"))
-        emotion_text = self.lang_manager.get_text(style_config['lang_key'])
+        emotion_text = self._t.emotion[style_config['lang_key']]
         
         self.emotion_label.setText(f"{style_config['icon']} {emotion_text}")
         self.emotion_label.setStyleSheet(
@@ -1039,19 +1233,21 @@ class MainWindow(QMainWindow):
     
     def log_message(self, message, level='info'):
         """添加日志消息"""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        
-        color_map = {
-            'info': 'black',
-            'success': 'green',
-            'warning': 'orange',
-            'error': 'red'
-        }
-        
-        color = color_map.get(level, 'black')
-        formatted_msg = f'<span style="color: {color};">[{timestamp}] {message}</span>'
-        
-        self.log_text.append(formatted_msg)
+        # 时间字符串按秒缓存，同一秒内的日志不再重复格式化
+        sec = int(time.time())
+        if sec != self._log_sec:
+            self._log_sec = sec
+            self._log_time_str = time.strftime('%H:%M:%S', time.localtime(sec))
+        prefix = self.LOG_PREFIX.get(level, self.LOG_PREFIX['info'])
+        self._log_pending.append(f'{prefix}[{self._log_time_str}] {message}</span>')
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+            
+    def _flush_log(self):
+        """将缓存的日志消息一次追加到日志框"""
+        if self._log_pending:
+            self.log_text.append('<br>'.join(self._log_pending))
+            self._log_pending.clear()
     
     def change_language(self, index):
         """切换语言"""
@@ -1059,84 +1255,113 @@ class MainWindow(QMainWindow):
         new_lang = lang_map.get(index, 'zh_CN')
         
         if self.lang_manager.set_language(new_lang):
+            self._t = self._build_text_cache()
             self.update_ui_language()
+            
+    def _build_text_cache(self):
+        """
+        预先解析事件处理和上传回调中频繁使用的文本（切换语言时重建）
+        
+        Returns:
+            SimpleNamespace: 文本缓存，格式化文本为 get_formatter 返回的函数
+        """
+        ns = self.lang_manager.get_namespace()
+        get_formatter = self.lang_manager.get_formatter
+        return SimpleNamespace(
+            connect=ns.connect,
+            disconnect=ns.disconnect,
+            status_connected=ns.status_connected,
+            status_disconnected=ns.status_disconnected,
+            pause=ns.pause,
+            resume=getattr(ns, 'continue'),  # continue 是关键字，不能作为属性名
+            paused=ns.paused,
+            continued=ns.continued,
+            emotion={key: getattr(ns, key) for key in ('emotion_happy', 'emotion_sad', 'emotion_neutral')},
+            upload_emotion_result=get_formatter('upload_emotion_result'),
+            upload_timeout=ns.upload_timeout,
+            upload_connection_error=ns.upload_connection_error,
+            upload_server_error=get_formatter('upload_server_error'),
+            upload_failed=get_formatter('upload_failed')
+        )
     
     def update_ui_language(self):
         """更新界面语言"""
+        t = self.lang_manager.get_many(self.UI_TEXT_KEYS)
+        
         # 更新窗口标题
-        self.setWindowTitle(self.lang_manager.get_text('window_title'))
+        self.setWindowTitle(t['window_title'])
         
         # 更新控制面板
-        self.findChild(QGroupBox).setTitle(self.lang_manager.get_text('control_panel'))
-        self.port_label.setText(self.lang_manager.get_text('serial_port'))
-        self.refresh_btn.setText(self.lang_manager.get_text('refresh'))
-        self.baudrate_label.setText(self.lang_manager.get_text('baudrate'))
+        self.findChild(QGroupBox).setTitle(t['control_panel'])
+        self.port_label.setText(t['serial_port'])
+        self.refresh_btn.setText(t['refresh'])
+        self.baudrate_label.setText(t['baudrate'])
         
         # 更新连接按钮
         if self.serial_handler.is_connected():
-            self.connect_btn.setText(self.lang_manager.get_text('disconnect'))
-            self.status_label.setText(self.lang_manager.get_text('status_connected'))
+            self.connect_btn.setText(self._t.disconnect)
+            self.status_label.setText(self._t.status_connected)
         else:
-            self.connect_btn.setText(self.lang_manager.get_text('connect'))
-            self.status_label.setText(self.lang_manager.get_text('status_disconnected'))
+            self.connect_btn.setText(self._t.connect)
+            self.status_label.setText(self._t.status_disconnected)
         
         # 更新暂停按钮
         if self.is_paused:
-            self.pause_btn.setText(self.lang_manager.get_text('continue'))
+            self.pause_btn.setText(self._t.resume)
         else:
-            self.pause_btn.setText(self.lang_manager.get_text('pause'))
+            self.pause_btn.setText(self._t.pause)
         
-        self.clear_btn.setText(self.lang_manager.get_text('clear'))
+        self.clear_btn.setText(t['clear'])
         
         # 更新录制按钮
         if self.data_recorder and self.data_recorder.is_recording:
-            self.record_btn.setText(self.lang_manager.get_text('stop'))
+            self.record_btn.setText(t['stop'])
         else:
-            self.record_btn.setText(self.lang_manager.get_text('record'))
+            self.record_btn.setText(t['record'])
         
-        self.export_btn.setText(self.lang_manager.get_text('export'))
-        self.sdata_checkbox.setText(self.lang_manager.get_text('virtual_data'))
-        self.sdata_checkbox.setToolTip(self.lang_manager.get_text('virtual_data_tooltip'))
-        self.lang_label.setText(self.lang_manager.get_text('language'))
+        self.export_btn.setText(t['export'])
+        self.sdata_checkbox.setText(t['virtual_data'])
+        self.sdata_checkbox.setToolTip(t['virtual_data_tooltip'])
+        self.lang_label.setText(t['language'])
         
         # 更新上传按钮
         if self.upload_btn.isChecked():
-            self.upload_btn.setText(self.lang_manager.get_text('upload_stop'))
+            self.upload_btn.setText(t['upload_stop'])
         else:
-            self.upload_btn.setText(self.lang_manager.get_text('upload_start'))
+            self.upload_btn.setText(t['upload_start'])
         
         # 更新情绪状态显示
-        self.emotion_title_label.setText(self.lang_manager.get_text('emotion_title'))
+        self.emotion_title_label.setText(t['emotion_title'])
         self.update_emotion_display(self.current_emotion)
         
         # 更新图表组框
-        self.eeg_group.setTitle(self.lang_manager.get_text('eeg_group'))
-        self.ppg_group.setTitle(self.lang_manager.get_text('ppg_group'))
-        self.imu_group.setTitle(self.lang_manager.get_text('imu_group'))
+        self.eeg_group.setTitle(t['eeg_group'])
+        self.ppg_group.setTitle(t['ppg_group'])
+        self.imu_group.setTitle(t['imu_group'])
         
         # 更新图表标签
-        self.eeg_plot.setLabel('left', self.lang_manager.get_text('amplitude'), units='μV')
-        self.eeg_plot.setLabel('bottom', self.lang_manager.get_text('time'), units='s')
-        self.ppg_plot.setLabel('left', self.lang_manager.get_text('amplitude'), units='μV')
-        self.ppg_plot.setLabel('bottom', self.lang_manager.get_text('time'), units='s')
-        self.imu_plot.setLabel('left', self.lang_manager.get_text('quaternion'))
-        self.imu_plot.setLabel('bottom', self.lang_manager.get_text('time'), units='s')
+        self.eeg_plot.setLabel('left', t['amplitude'], units='μV')
+        self.eeg_plot.setLabel('bottom', t['time'], units='s')
+        self.ppg_plot.setLabel('left', t['amplitude'], units='μV')
+        self.ppg_plot.setLabel('bottom', t['time'], units='s')
+        self.imu_plot.setLabel('left', t['quaternion'])
+        self.imu_plot.setLabel('bottom', t['time'], units='s')
         
         # 更新图例（需要重新创建曲线来更新图例）
         # 清除并重新添加EEG图例
         self.eeg_plot.plotItem.legend.removeItem(self.eeg_raw_curve)
         self.eeg_plot.plotItem.legend.removeItem(self.eeg_filtered_curve)
-        self.eeg_plot.plotItem.legend.addItem(self.eeg_raw_curve, self.lang_manager.get_text('raw'))
-        self.eeg_plot.plotItem.legend.addItem(self.eeg_filtered_curve, self.lang_manager.get_text('filtered'))
+        self.eeg_plot.plotItem.legend.addItem(self.eeg_raw_curve, t['raw'])
+        self.eeg_plot.plotItem.legend.addItem(self.eeg_filtered_curve, t['filtered'])
         
         # 清除并重新添加PPG图例
         self.ppg_plot.plotItem.legend.removeItem(self.ppg_ir_raw_curve)
         self.ppg_plot.plotItem.legend.removeItem(self.ppg_ir_filtered_curve)
-        self.ppg_plot.plotItem.legend.addItem(self.ppg_ir_raw_curve, self.lang_manager.get_text('raw'))
-        self.ppg_plot.plotItem.legend.addItem(self.ppg_ir_filtered_curve, self.lang_manager.get_text('filtered'))
+        self.ppg_plot.plotItem.legend.addItem(self.ppg_ir_raw_curve, t['raw'])
+        self.ppg_plot.plotItem.legend.addItem(self.ppg_ir_filtered_curve, t['filtered'])
         
         # 更新日志区域
-        self.log_group.setTitle(self.lang_manager.get_text('log_area'))
+        self.log_group.setTitle(t['log_area'])
         
     def closeEvent(self, event):
         """关闭窗口事件"""
@@ -1151,8 +1376,10 @@ class MainWindow(QMainWindow):
                 if self.data_recorder and self.data_recorder.is_recording:
                     self.data_recorder.stop_recording()
                 self.serial_handler.disconnect()
+                self.upload_worker.stop()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.upload_worker.stop()
             event.accept()
@@ -0,0 +1,143 @@
+"""
+DSP计算内核
+将去直流、移动平均、高斯平滑等逐点运算融合为单次循环；
+安装了numba时JIT编译为本地代码，否则使用等价的numpy实现
+"""
+
+import numpy as np
+from scipy import signal
+from scipy.ndimage import uniform_filter1d
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def gaussian_kernel(sigma):
+    """
+    生成归一化的高斯卷积核
+    
+    Args:
+        sigma: 标准差（采样点）
+        
+    Returns:
+        numpy.ndarray: 奇数长度的卷积核
+    """
+    window_size = int(6 * sigma)
+    if window_size % 2 == 0:
+        window_size += 1
+    x = np.arange(window_size) - window_size // 2
+    gauss = np.exp(-(x**2) / (2 * sigma**2))
+    return gauss / gauss.sum()
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def demean_and_absmax(x, scale, out):
+        """去直流并缩放：out = (x - mean(x)) * scale，写入的同时求最大绝对值并返回"""
+        n = x.shape[0]
+        s = 0.0
+        for i in range(n):
+            s += x[i]
+        mean = s / n
+        peak = 0.0
+        for i in range(n):
+            v = (x[i] - mean) * scale
+            out[i] = v
+            peak = max(peak, abs(v))
+        return peak
+        
+    @njit(cache=True, fastmath=True)
+    def demean_movavg5(x, out):
+        """逐列去直流后做5点移动平均（等价于 np.convolve(..., mode='same')）"""
+        n, m = x.shape
+        for j in range(m):
+            s = 0.0
+            for i in range(n):
+                s += x[i, j]
+            mean = s / n
+            for i in range(n):
+                acc = 0.0
+                for k in range(max(i - 2, 0), min(i + 3, n)):
+                    acc += x[k, j] - mean
+                out[i, j] = acc / 5.0
+        return out
+        
+    @njit(cache=True, fastmath=True)
+    def convolve_same(x, kernel, out):
+        """与输入等长的卷积（边界补零）"""
+        n = x.shape[0]
+        k_len = kernel.shape[0]
+        c = (k_len - 1) // 2
+        for i in range(n):
+            acc = 0.0
+            for j in range(k_len):
+                k = i + c - j
+                if 0 <= k < n:
+                    acc += kernel[j] * x[k]
+            out[i] = acc
+        return out
+        
+    @njit(cache=True)
+    def summary_stats(x):
+        """单次遍历计算 (最小值, 最大值, 均值, 标准差)，方差使用Welford递推"""
+        lo = x[0]
+        hi = x[0]
+        mean = 0.0
+        m2 = 0.0
+        for i in range(x.shape[0]):
+            v = x[i]
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+            delta = v - mean
+            mean += delta / (i + 1)
+            m2 += delta * (v - mean)
+        return float(lo), float(hi), mean, np.sqrt(m2 / x.shape[0])
+        
+    @njit(cache=True)
+    def sosfilt_stream(sos, x, zi, out):
+        """
+        二阶节级联滤波（直接II型转置，与 scipy.signal.sosfilt 相同的递推），原地更新zi
+        
+        递推滤波对运算顺序敏感，因此不启用fastmath。
+        """
+        n_sections = sos.shape[0]
+        for i in range(x.shape[0]):
+            v = x[i]
+            for k in range(n_sections):
+                y = sos[k, 0] * v + zi[k, 0]
+                zi[k, 0] = sos[k, 1] * v - sos[k, 4] * y + zi[k, 1]
+                zi[k, 1] = sos[k, 2] * v - sos[k, 5] * y
+                v = y
+            out[i] = v
+        return out
+else:
+    def demean_and_absmax(x, scale, out):
+        """去直流并缩放：out = (x - mean(x)) * scale，返回最大绝对值"""
+        np.subtract(x, x.mean(), out=out)
+        out *= scale
+        return float(max(out.max(), -out.min()))
+        
+    def demean_movavg5(x, out):
+        """逐列去直流后做5点移动平均（等价于 np.convolve(..., mode='same')）"""
+        ac = np.ascontiguousarray(x - x.mean(axis=0))
+        uniform_filter1d(ac, size=5, axis=0, output=out, mode='constant')
+        return out
+        
+    def convolve_same(x, kernel, out):
+        """与输入等长的卷积（边界补零）"""
+        c = (len(kernel) - 1) // 2
+        out[:] = np.convolve(x, kernel, mode='full')[c:c + len(x)]
+        return out
+        
+    def summary_stats(x):
+        """计算 (最小值, 最大值, 均值, 标准差)"""
+        return float(x.min()), float(x.max()), float(x.mean()), float(x.std())
+        
+    def sosfilt_stream(sos, x, zi, out):
+        """二阶节级联滤波（直接II型转置），原地更新zi"""
+        out[:], zi[:] = signal.sosfilt(sos, x, zi=zi)
+        return out
@@ -8,24 +8,56 @@ import json
 from datetime import datetime
 import os
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _rows_from_columns(relative_time, columns):
+    """
+    由字段数组逐行生成CSV行
+    
+    Args:
+        relative_time: 相对时间（秒）数组
+        columns: 字段数组字典（ads1118、red_led、ir_led、quat）
+        
+    Returns:
+        generator: CSV行
+    """
+    return ([f'{t:.6f}', eeg, red, ir, *quat]
+            for t, eeg, red, ir, quat in zip(relative_time.tolist(),
+                                             columns['ads1118'].tolist(),
+                                             columns['red_led'].tolist(),
+                                             columns['ir_led'].tolist(),
+                                             columns['quat'].tolist()))
+
 
 class DataRecorder:
     """数据录制类"""
     
+    # 行缓冲的容量：攒够后一次 writerows 写出（500Hz下约1秒一次）
+    ROW_BUFFER_SIZE = 500
+    
     def __init__(self):
         self.is_recording = False
         self.filename = None
         self.file_handle = None
         self.csv_writer = None
         self.data_count = 0
-        self.start_time = None
+        self.sample_rate = 500
+        self._inv_sr = 1.0 / self.sample_rate
+        self._row_buf = []
         
-    def start_recording(self, filename=None):
+    def start_recording(self, filename=None, sample_rate=500):
         """
         开始录制
         
         Args:
             filename: 文件名，如果为None则自动生成
+            sample_rate: 采样率（Hz），用于由样本序号计算相对时间戳
         """
         if self.is_recording:
             return False
@@ -36,7 +68,7 @@ class DataRecorder:
             
         try:
             self.filename = filename
-            self.file_handle = open(filename, 'w', newline='', encoding='utf-8')
+            self.file_handle = open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20)
             self.csv_writer = csv.writer(self.file_handle)
             
             # 写入表头
@@ -48,7 +80,9 @@ class DataRecorder:
             
             self.is_recording = True
             self.data_count = 0
-            self.start_time = None
+            self.sample_rate = sample_rate
+            self._inv_sr = 1.0 / sample_rate
+            self._row_buf = []
             return True
             
         except Exception as e:
@@ -66,12 +100,8 @@ class DataRecorder:
             return False
             
         try:
-            # 记录开始时间
-            if self.start_time is None:
-                self.start_time = parsed_data['timestamp']
-            
-            # 计算相对时间戳（秒）
-            relative_time = (parsed_data['timestamp'] - self.start_time).total_seconds()
+            # 相对时间戳（秒）：DataBuffer写入的是均匀时间戳，直接由样本序号计算
+            relative_time = self.data_count * self._inv_sr
             
             row = [
                 f'{relative_time:.6f}',
@@ -83,7 +113,9 @@ class DataRecorder:
                 parsed_data['quat'][2] if 'quat' in parsed_data else '',
                 parsed_data['quat'][3] if 'quat' in parsed_data else '',
             ]
-            self.csv_writer.writerow(row)
+            self._row_buf.append(row)
+            if len(self._row_buf) >= self.ROW_BUFFER_SIZE:
+                self.flush()
             self.data_count += 1
             return True
             
@@ -91,6 +123,36 @@ class DataRecorder:
             print(f"添加数据失败: {e}")
             return False
             
+    def add_batch(self, columns):
+        """
+        批量添加数据
+        
+        Args:
+            columns: DataParser.parse_many 返回的字段数组字典
+        """
+        if not self.is_recording or self.csv_writer is None:
+            return False
+            
+        try:
+            k = len(columns['quat'])
+            # 相对时间戳（秒）：由样本序号计算
+            relative_time = (self.data_count + np.arange(k)) * self._inv_sr
+            self._row_buf.extend(_rows_from_columns(relative_time, columns))
+            if len(self._row_buf) >= self.ROW_BUFFER_SIZE:
+                self.flush()
+            self.data_count += k
+            return True
+            
+        except Exception as e:
+            print(f"添加数据失败: {e}")
+            return False
+            
+    def flush(self):
+        """将缓冲的行写入文件"""
+        if self._row_buf and self.csv_writer is not None:
+            self.csv_writer.writerows(self._row_buf)
+            self._row_buf.clear()
+            
     def stop_recording(self):
         """
         停止录制
@@ -102,6 +164,7 @@ class DataRecorder:
             return None
             
         if self.file_handle:
+            self.flush()
             self.file_handle.close()
             
         self.is_recording = False
@@ -160,6 +223,45 @@ def export_to_csv(data_list, filename):
         return False
 
 
+def export_columns_to_csv(columns, filename):
+    """
+    将字段数组导出到CSV文件（格式与export_to_csv相同）
+    
+    Args:
+        columns: 字段数组字典，timestamp为unix秒，quat为(N, 4)
+        filename: 文件名
+        
+    Returns:
+        bool: 是否成功
+    """
+    try:
+        ts = columns['timestamp']
+        relative_time = ts - ts[0] if len(ts) else ts
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            
+            # 写入表头
+            header = [
+                'timestamp', 'ads1118',
+                'red_led', 'ir_led', 'quat_0', 'quat_1', 'quat_2', 'quat_3'
+            ]
+            writer.writerow(header)
+            writer.writerows(_rows_from_columns(relative_time, columns))
+            
+        return True
+        
+    except Exception as e:
+        print(f"导出CSV失败: {e}")
+        return False
+
+
+def _json_default(obj):
+    """JSON序列化回调：datetime转换为字符串"""
+    if isinstance(obj, datetime):
+        return obj.strftime('%Y-%m-%d %H:%M:%S.%f')
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
+
 def export_to_json(data_list, filename):
     """
     导出数据到JSON文件
@@ -172,15 +274,14 @@ def export_to_json(data_list, filename):
         bool: 是否成功
     """
     try:
-        # 转换datetime对象为字符串
-        export_data = []
-        for data in data_list:
-            data_copy = data.copy()
-            data_copy['timestamp'] = data['timestamp'].strftime('%Y-%m-%d %H:%M:%S.%f')
-            export_data.append(data_copy)
-            
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        # datetime在序列化时由_json_default转换为字符串，无需逐条复制记录
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data_list, default=_json_default,
+                                     option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data_list, f, default=_json_default, ensure_ascii=False)
             
         return True
         
@@ -193,36 +294,30 @@ def load_from_csv(filename):
     """
     从CSV文件加载数据
     
+    整个表格由 np.loadtxt 一次解析为数组，按列返回（不再逐行构造字典）。
+    
     Args:
-        filename: 文件名
+        filename: 文件名（DataRecorder或export_to_csv生成的CSV）
         
     Returns:
-        list: 数据列表
+        dict: 字段名 -> numpy数组，timestamp为相对时间（秒），quat为(N, 4)；
+              格式与 DataParser.parse_many 一致，可直接交给 DataBuffer.add_batch。
+              加载失败时返回空字典
     """
     try:
-        data_list = []
         with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data = {
-                    'timestamp': datetime.strptime(row['timestamp'], '%Y-%m-%d %H:%M:%S.%f'),
-                    'frame_id': int(row['frame_id']) if row['frame_id'] else 0,
-                    'ads1118': int(row['ads1118']) if row['ads1118'] else 0,
-                    'adc_ch0': int(row['adc_ch0']) if row['adc_ch0'] else 0,
-                    'adc_ch1': int(row['adc_ch1']) if row['adc_ch1'] else 0,
-                    'red_led': int(row['red_led']) if row['red_led'] else 0,
-                    'ir_led': int(row['ir_led']) if row['ir_led'] else 0,
-                    'quat': [
-                        int(row['quat_0']) if row['quat_0'] else 0,
-                        int(row['quat_1']) if row['quat_1'] else 0,
-                        int(row['quat_2']) if row['quat_2'] else 0,
-                        int(row['quat_3']) if row['quat_3'] else 0,
-                    ]
-                }
-                data_list.append(data)
-                
-        return data_list
+            header = next(csv.reader(f))
+            table = np.loadtxt(f, delimiter=',', ndmin=2)
+            
+        columns = dict(zip(header, table.T))
+        data = {'timestamp': columns.pop('timestamp')}
+        quat_names = ['quat_0', 'quat_1', 'quat_2', 'quat_3']
+        if all(name in columns for name in quat_names):
+            data['quat'] = np.column_stack([columns.pop(name) for name in quat_names]).astype(np.int32)
+        for name, values in columns.items():
+            data[name] = values.astype(np.int32)
+        return data
         
     except Exception as e:
         print(f"加载CSV失败: {e}")
-        return []
+        return {}
@@ -0,0 +1,4 @@
+"""
+界面文本
+每种语言一个模块，导出文本表 TEXTS，由 LanguageManager 按需导入
+"""
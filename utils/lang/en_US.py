@@ -0,0 +1,100 @@
+"""
+英文界面文本
+"""
+
+TEXTS = {
+    # Window title
+    'window_title': 'Physiological Signal Acquisition System v1.0',
+    'app_name': 'Physiological Signal System',
+    
+    # Control panel
+    'control_panel': 'Control Panel',
+    'serial_port': 'Port:',
+    'refresh': 'Refresh',
+    'baudrate': 'Baudrate:',
+    'connect': 'Connect',
+    'disconnect': 'Disconnect',
+    'pause': 'Pause',
+    'continue': 'Continue',
+    'clear': 'Clear',
+    'record': 'Record',
+    'stop': 'Stop',
+    'export': 'Export',
+    'virtual_data': 'Data Source',
+    'virtual_data_tooltip': 'Switch data source',
+    'status_disconnected': 'Disconnected',
+    'status_connected': 'Connected',
+    'language': 'Language:',
+    
+    # Chart groups
+    'eeg_group': 'EEG',
+    'ppg_group': 'PPG',
+    'imu_group': 'IMU',
+    
+    # Chart labels
+    'amplitude': 'Amplitude',
+    'time': 'Time',
+    'quaternion': 'Quaternion',
+    'raw': 'Raw',
+    'filtered': 'Filtered',
+    
+    # Log area
+    'log_area': 'Log',
+    
+    # Messages
+    'system_init': 'System initialized',
+    'ports_found': 'Found {0} available port(s)',
+    'no_ports': 'No ports found',
+    'select_port_warning': 'Please select a port!',
+    'connected_to': 'Connected to {0} @ {1} bps',
+    'connect_failed': 'Connection failed: {0}',
+    'paused': 'Paused',
+    'continued': 'Continued',
+    'data_cleared': 'Data cleared',
+    'recording_started': 'Recording started',
+    'recording_stopped': 'Recording stopped: {0}',
+    'no_data_export': 'No data to export!',
+    'data_exported': 'Data exported to: {0}',
+    'export_failed': 'Export failed!',
+    'virtual_enabled': 'Data source switched',
+    'virtual_disabled': 'Data source switched',
+    'virtual_load_failed': 'Failed to load data source',
+    'loading_virtual': 'Loading data source...',
+    'virtual_file_not_found': 'Data source file not found:\n{0}',
+    'virtual_no_fp1_fp2': 'Fp1 or Fp2 channel not found in data source',
+    'virtual_no_ppg': 'PPG channel not found in data source',
+    'virtual_load_error': 'Error loading data:\n{0}',
+    'virtual_loaded': 'Data source loaded (Sample rate: {0} Hz)',
+    'eeg_range': 'EEG range: [{0:.1f}, {1:.1f}] μV, mean: {2:.1f} μV, std: {3:.1f} μV',
+    'ppg_range': 'PPG range: [{0:.1f}, {1:.1f}] μV, mean: {2:.1f} μV, std: {3:.1f} μV',
+    'eeg_loaded': 'EEG data loaded, length: {0} pts',
+    'ppg_loaded': 'PPG data loaded, length: {0} pts',
+    
+    # Emotion status
+    'emotion_title': 'Emotion Status',
+    'emotion_happy': 'Happy',
+    'emotion_sad': 'Sad',
+    'emotion_neutral': 'Neutral',
+    'emotion_unknown': 'Unknown',
+    
+    # Cloud upload
+    'upload_start': 'Start Upload',
+    'upload_stop': 'Stop Upload',
+    'upload_started': 'Upload started, every {0}s',
+    'upload_stopped': 'Upload stopped',
+    'upload_insufficient_data': 'Insufficient data, please collect at least 1 second',
+    'upload_emotion_result': 'Emotion: {0} (Confidence: {1:.1%})',
+    'upload_server_error': 'Server error: {0}',
+    'upload_timeout': 'Connection timeout',
+    'upload_connection_error': 'Cannot connect to server',
+    'upload_failed': 'Upload failed: {0}',
+    
+    # Dialogs
+    'warning': 'Warning',
+    'error': 'Error',
+    'confirm': 'Confirm',
+    'confirm_clear': 'Are you sure you want to clear all data?',
+    'confirm_exit': 'Serial port is still connected. Are you sure you want to exit?',
+    'export_data_title': 'Export Data',
+    'csv_files': 'CSV Files (*.csv);;All Files (*)',
+}
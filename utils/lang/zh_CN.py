@@ -0,0 +1,100 @@
+"""
+简体中文界面文本
+"""
+
+TEXTS = {
+    # 窗口标题
+    'window_title': '生理信号采集系统 v1.0',
+    'app_name': '生理信号采集系统',
+    
+    # 控制面板
+    'control_panel': '控制面板',
+    'serial_port': '串口:',
+    'refresh': '刷新',
+    'baudrate': '波特率:',
+    'connect': '连接',
+    'disconnect': '断开',
+    'pause': '暂停',
+    'continue': '继续',
+    'clear': '清空',
+    'record': '录制',
+    'stop': '停止',
+    'export': '导出',
+    'virtual_data': '数据源',
+    'virtual_data_tooltip': '切换数据来源',
+    'status_disconnected': '未连接',
+    'status_connected': '已连接',
+    'language': '语言:',
+    
+    # 图表组框
+    'eeg_group': 'EEG',
+    'ppg_group': 'PPG',
+    'imu_group': 'IMU',
+    
+    # 图表标签
+    'amplitude': '幅值',
+    'time': '时间',
+    'quaternion': '四元数',
+    'raw': '原始',
+    'filtered': '滤波',
+    
+    # 日志区域
+    'log_area': '日志',
+    
+    # 消息提示
+    'system_init': '系统初始化完成',
+    'ports_found': '发现 {0} 个可用串口',
+    'no_ports': '未发现可用串口',
+    'select_port_warning': '请选择串口!',
+    'connected_to': '已连接到 {0} @ {1} bps',
+    'connect_failed': '连接失败: {0}',
+    'paused': '已暂停',
+    'continued': '已继续',
+    'data_cleared': '数据已清空',
+    'recording_started': '开始录制',
+    'recording_stopped': '录制已停止: {0}',
+    'no_data_export': '没有数据可以导出!',
+    'data_exported': '数据已导出到: {0}',
+    'export_failed': '数据导出失败!',
+    'virtual_enabled': '数据源已切换',
+    'virtual_disabled': '数据源已切换',
+    'virtual_load_failed': '数据源加载失败',
+    'loading_virtual': '正在加载数据源...',
+    'virtual_file_not_found': '数据源文件不存在:\n{0}',
+    'virtual_no_fp1_fp2': '数据源中未找到 Fp1 或 Fp2 通道',
+    'virtual_no_ppg': '数据源中未找到 PPG 通道',
+    'virtual_load_error': '加载数据时出错:\n{0}',
+    'virtual_loaded': '数据源已加载 (采样率: {0} Hz)',
+    'eeg_range': 'EEG数据范围: [{0:.1f}, {1:.1f}] μV, 均值: {2:.1f} μV, 标准差: {3:.1f} μV',
+    'ppg_range': 'PPG数据范围: [{0:.1f}, {1:.1f}] μV, 均值: {2:.1f} μV, 标准差: {3:.1f} μV',
+    'eeg_loaded': '已加载EEG数据, 长度: {0} 点',
+    'ppg_loaded': '已加载PPG数据, 长度: {0} 点',
+    
+    # 情绪状态
+    'emotion_title': '当前情绪状态',
+    'emotion_happy': '开心',
+    'emotion_sad': '悲伤',
+    'emotion_neutral': '中性',
+    'emotion_unknown': '未知',
+    
+    # 云端上传
+    'upload_start': '开始上传',
+    'upload_stop': '停止上传',
+    'upload_started': '已开始持续上传，每{0}秒上传一次',
+    'upload_stopped': '已停止上传',
+    'upload_insufficient_data': '数据不足，请至少采集1秒数据后再上传',
+    'upload_emotion_result': '情绪: {0} (置信度: {1:.1%})',
+    'upload_server_error': '服务器错误: {0}',
+    'upload_timeout': '连接超时',
+    'upload_connection_error': '无法连接到服务器',
+    'upload_failed': '上传失败: {0}',
+    
+    # 对话框
+    'warning': '警告',
+    'error': '错误',
+    'confirm': '确认',
+    'confirm_clear': '确定要清空所有数据吗?',
+    'confirm_exit': '串口仍在连接中，确定要退出吗?',
+    'export_data_title': '导出数据',
+    'csv_files': 'CSV Files (*.csv);;All Files (*)',
+}
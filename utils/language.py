@@ -3,239 +3,152 @@
 支持中英文切换
 """
 
+import importlib
+import re
+import string
+import sys
+from types import MappingProxyType, SimpleNamespace
+
+# 与 % 格式含义相同的格式说明（不含对齐、'%'、','等 str.format 特有的写法）
+_PRINTF_SPEC = re.compile(r'([+ 0]*\d*(\.\d+)?[dxXeEfFgG])?')
+
+
+def _compile_format(template):
+    """
+    将模板预先转换为格式化函数
+    
+    只含按顺序出现的位置参数（{0}、{1:.1f}…）的模板转换为 % 格式串，调用时
+    不再重复解析花括号语法；其他模板返回绑定的 str.format。
+    
+    Args:
+        template: str.format 模板
+        
+    Returns:
+        callable: 接受位置参数、返回格式化文本的函数
+    """
+    parts = []
+    expected = 0
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace('%', '%%'))
+        if field is None:
+            continue
+        if conversion or field not in ('', str(expected)) or not _PRINTF_SPEC.fullmatch(spec):
+            return template.format
+        parts.append('%' + (spec or 's'))
+        expected += 1
+    pattern = ''.join(parts)
+    return lambda *args: pattern % args
+
+
+def _intern_table(table):
+    """
+    返回键和较短文本都经过 sys.intern 的文本表
+    
+    调用处的字面量键与表中的键是同一对象，查找时按指针即可命中；
+    各语言相同的文本（如 'EEG'、'PPG'）共享同一个字符串对象。
+    """
+    return {sys.intern(key): sys.intern(text) if len(text) < 128 else text
+            for key, text in table.items()}
+
+
 class LanguageManager:
     """语言管理器"""
     
-    # 语言配置字典
-    LANGUAGES = {
-        'zh_CN': {
-            # 窗口标题
-            'window_title': '生理信号采集系统 v1.0',
-            'app_name': '生理信号采集系统',
-            
-            # 控制面板
-            'control_panel': '控制面板',
-            'serial_port': '串口:',
-            'refresh': '刷新',
-            'baudrate': '波特率:',
-            'connect': '连接',
-            'disconnect': '断开',
-            'pause': '暂停',
-            'continue': '继续',
-            'clear': '清空',
-            'record': '录制',
-            'stop': '停止',
-            'export': '导出',
-            'virtual_data': '数据源',
-            'virtual_data_tooltip': '切换数据来源',
-            'status_disconnected': '未连接',
-            'status_connected': '已连接',
-            'language': '语言:',
-            
-            # 图表组框
-            'eeg_group': 'EEG',
-            'ppg_group': 'PPG',
-            'imu_group': 'IMU',
-            
-            # 图表标签
-            'amplitude': '幅值',
-            'time': '时间',
-            'quaternion': '四元数',
-            'raw': '原始',
-            'filtered': '滤波',
-            
-            # 日志区域
-            'log_area': '日志',
-            
-            # 消息提示
-            'system_init': '系统初始化完成',
-            'ports_found': '发现 {0} 个可用串口',
-            'no_ports': '未发现可用串口',
-            'select_port_warning': '请选择串口!',
-            'connected_to': '已连接到 {0} @ {1} bps',
-            'connect_failed': '连接失败: {0}',
-            'paused': '已暂停',
-            'continued': '已继续',
-            'data_cleared': '数据已清空',
-            'recording_started': '开始录制',
-            'recording_stopped': '录制已停止: {0}',
-            'no_data_export': '没有数据可以导出!',
-            'data_exported': '数据已导出到: {0}',
-            'export_failed': '数据导出失败!',
-            'virtual_enabled': '数据源已切换',
-            'virtual_disabled': '数据源已切换',
-            'virtual_load_failed': '数据源加载失败',
-            'loading_virtual': '正在加载数据源...',
-            'virtual_file_not_found': '数据源文件不存在:\n{0}',
-            'virtual_no_fp1_fp2': '数据源中未找到 Fp1 或 Fp2 通道',
-            'virtual_no_ppg': '数据源中未找到 PPG 通道',
-            'virtual_load_error': '加载数据时出错:\n{0}',
-            'virtual_loaded': '数据源已加载 (采样率: {0} Hz)',
-            'eeg_range': 'EEG数据范围: [{0:.1f}, {1:.1f}] μV, 均值: {2:.1f} μV, 标准差: {3:.1f} μV',
-            'ppg_range': 'PPG数据范围: [{0:.1f}, {1:.1f}] μV, 均值: {2:.1f} μV, 标准差: {3:.1f} μV',
-            'eeg_loaded': '已加载EEG数据, 长度: {0} 点',
-            'ppg_loaded': '已加载PPG数据, 长度: {0} 点',
-            
-            # 情绪状态
-            'emotion_title': '当前情绪状态',
-            'emotion_happy': '开心',
-            'emotion_sad': '悲伤',
-            'emotion_neutral': '中性',
-            'emotion_unknown': '未知',
-            
-            # 云端上传
-            'upload_start': '开始上传',
-            'upload_stop': '停止上传',
-            'upload_started': '已开始持续上传，每{0}秒上传一次',
-            'upload_stopped': '已停止上传',
-            'upload_insufficient_data': '数据不足，请至少采集1秒数据后再上传',
-            'upload_emotion_result': '情绪: {0} (置信度: {1:.1%})',
-            'upload_server_error': '服务器错误: {0}',
-            'upload_timeout': '连接超时',
-            'upload_connection_error': '无法连接到服务器',
-            'upload_failed': '上传失败: {0}',
-            'upload_stop': '停止上传',
-            'upload_started': '已开始持续上传，每{0}秒上传一次',
-            'upload_stopped': '已停止上传',
-            'upload_insufficient_data': '数据不足，请至少采集1秒数据后再上传',
-            'upload_emotion_result': '情绪: {0} (置信度: {1:.1%})',
-            'upload_server_error': '服务器错误: {0}',
-            'upload_timeout': '连接超时',
-            'upload_connection_error': '无法连接到服务器',
-            'upload_failed': '上传失败: {0}',
-            
-            # 对话框
-            'warning': '警告',
-            'error': '错误',
-            'confirm': '确认',
-            'confirm_clear': '确定要清空所有数据吗?',
-            'confirm_exit': '串口仍在连接中，确定要退出吗?',
-            'export_data_title': '导出数据',
-            'csv_files': 'CSV Files (*.csv);;All Files (*)',
-        },
-        'en_US': {
-            # Window title
-            'window_title': 'Physiological Signal Acquisition System v1.0',
-            'app_name': 'Physiological Signal System',
-            
-            # Control panel
-            'control_panel': 'Control Panel',
-            'serial_port': 'Port:',
-            'refresh': 'Refresh',
-            'baudrate': 'Baudrate:',
-            'connect': 'Connect',
-            'disconnect': 'Disconnect',
-            'pause': 'Pause',
-            'continue': 'Continue',
-            'clear': 'Clear',
-            'record': 'Record',
-            'stop': 'Stop',
-            'export': 'Export',
-            'virtual_data': 'Data Source',
-            'virtual_data_tooltip': 'Switch data source',
-            'status_disconnected': 'Disconnected',
-            'status_connected': 'Connected',
-            'language': 'Language:',
-            
-            # Chart groups
-            'eeg_group': 'EEG',
-            'ppg_group': 'PPG',
-            'imu_group': 'IMU',
-            
-            # Chart labels
-            'amplitude': 'Amplitude',
-            'time': 'Time',
-            'quaternion': 'Quaternion',
-            'raw': 'Raw',
-            'filtered': 'Filtered',
-            
-            # Log area
-            'log_area': 'Log',
-            
-            # Messages
-            'system_init': 'System initialized',
-            'ports_found': 'Found {0} available port(s)',
-            'no_ports': 'No ports found',
-            'select_port_warning': 'Please select a port!',
-            'connected_to': 'Connected to {0} @ {1} bps',
-            'connect_failed': 'Connection failed: {0}',
-            'paused': 'Paused',
-            'continued': 'Continued',
-            'data_cleared': 'Data cleared',
-            'recording_started': 'Recording started',
-            'recording_stopped': 'Recording stopped: {0}',
-            'no_data_export': 'No data to export!',
-            'data_exported': 'Data exported to: {0}',
-            'export_failed': 'Export failed!',
-            'virtual_enabled': 'Data source switched',
-            'virtual_disabled': 'Data source switched',
-            'virtual_load_failed': 'Failed to load data source',
-            'loading_virtual': 'Loading data source...',
-            'virtual_file_not_found': 'Data source file not found:\n{0}',
-            'virtual_no_fp1_fp2': 'Fp1 or Fp2 channel not found in data source',
-            'virtual_no_ppg': 'PPG channel not found in data source',
-            'virtual_load_error': 'Error loading data:\n{0}',
-            'virtual_loaded': 'Data source loaded (Sample rate: {0} Hz)',
-            'eeg_range': 'EEG range: [{0:.1f}, {1:.1f}] μV, mean: {2:.1f} μV, std: {3:.1f} μV',
-            'ppg_range': 'PPG range: [{0:.1f}, {1:.1f}] μV, mean: {2:.1f} μV, std: {3:.1f} μV',
-            'eeg_loaded': 'EEG data loaded, length: {0} pts',
-            'ppg_loaded': 'PPG data loaded, length: {0} pts',
-            
-            # Emotion status
-            'emotion_title': 'Emotion Status',
-            'emotion_happy': 'Happy',
-            'emotion_sad': 'Sad',
-            'emotion_neutral': 'Neutral',
-            'emotion_unknown': 'Unknown',
-            
-            # Cloud upload
-            'upload_start': 'Start Upload',
-            'upload_stop': 'Stop Upload',
-            'upload_started': 'Upload started, every {0}s',
-            'upload_stopped': 'Upload stopped',
-            'upload_insufficient_data': 'Insufficient data, please collect at least 1 second',
-            'upload_emotion_result': 'Emotion: {0} (Confidence: {1:.1%})',
-            'upload_server_error': 'Server error: {0}',
-            'upload_timeout': 'Connection timeout',
-            'upload_connection_error': 'Cannot connect to server',
-            'upload_failed': 'Upload failed: {0}',
-            'upload_stopped': 'Upload stopped',
-            'upload_insufficient_data': 'Insufficient data, please collect at least 1 second',
-            'upload_emotion_result': 'Emotion: {0} (Confidence: {1:.1%})',
-            'upload_server_error': 'Server error: {0}',
-            'upload_timeout': 'Connection timeout',
-            'upload_connection_error': 'Cannot connect to server',
-            'upload_failed': 'Upload failed: {0}',
-            
-            # Dialogs
-            'warning': 'Warning',
-            'error': 'Error',
-            'confirm': 'Confirm',
-            'confirm_clear': 'Are you sure you want to clear all data?',
-            'confirm_exit': 'Serial port is still connected. Are you sure you want to exit?',
-            'export_data_title': 'Export Data',
-            'csv_files': 'CSV Files (*.csv);;All Files (*)',
-        }
-    }
+    __slots__ = ('current_language', '_table', '_fmt_cache')
+    
+    # 可用语言：语言代码 -> 显示名称（只读，各语言的文本表位于 utils/lang/<语言>.py）
+    AVAILABLE_LANGUAGES = MappingProxyType({
+        'zh_CN': '中文',
+        'en_US': 'English'
+    })
+    SUPPORTED_LANGUAGES = tuple(AVAILABLE_LANGUAGES)
+    
+    # 已加载的文本表：语言 -> 文本表（首次使用某种语言时才导入）
+    _loaded = {}
+    # 文本表的属性访问形式：语言 -> SimpleNamespace
+    _namespaces = {}
+    
+    @classmethod
+    def _load_table(cls, lang):
+        """
+        获取指定语言的文本表，首次使用时导入对应模块
+        
+        Args:
+            lang: 语言代码
+            
+        Returns:
+            MappingProxyType: 只读文本表（不支持的语言返回空字典）
+        """
+        table = cls._loaded.get(lang)
+        if table is None:
+            if lang not in cls.SUPPORTED_LANGUAGES:
+                return {}
+            module = importlib.import_module(f'utils.lang.{lang}')
+            # 文本表在所有实例间共享，以只读视图发布，避免被调用方意外修改
+            table = cls._loaded[lang] = MappingProxyType(_intern_table(module.TEXTS))
+        return table
     
     def __init__(self, default_lang='zh_CN'):
         """初始化语言管理器"""
         self.current_language = default_lang
+        # 当前语言的文本表（切换语言时更新），get_text只需查一次字典
+        self._table = self._load_table(default_lang)
+        self._fmt_cache = {}  # (语言, 键) -> 预编译的格式化函数
     
     def get_text(self, key):
         """获取指定键的文本"""
-        return self.LANGUAGES.get(self.current_language, {}).get(key, key)
+        return self._table.get(key, key)
+        
+    def get_formatter(self, key):
+        """
+        获取指定键的格式化函数（按语言缓存，模板只解析一次）
+        
+        Args:
+            key: 文本键
+            
+        Returns:
+            callable: 用法与 get_text(key).format 相同
+        """
+        cache_key = (self.current_language, key)
+        formatter = self._fmt_cache.get(cache_key)
+        if formatter is None:
+            formatter = self._fmt_cache[cache_key] = _compile_format(self.get_text(key))
+        return formatter
     
+    def get_namespace(self):
+        """
+        获取当前语言文本表的属性访问形式（每种语言只构造一次）
+        
+        Returns:
+            SimpleNamespace: 文本键为属性名（如 ns.connect），
+                             与关键字同名的键（如 'continue'）需用 getattr 访问
+        """
+        ns = self._namespaces.get(self.current_language)
+        if ns is None:
+            ns = self._namespaces[self.current_language] = SimpleNamespace(**self._table)
+        return ns
+        
+    def get_many(self, keys):
+        """
+        批量获取多个键的文本
+        
+        Args:
+            keys: 键的序列
+            
+        Returns:
+            dict: 键 -> 文本（未定义的键返回键本身）
+        """
+        table = self._table
+        return {key: table.get(key, key) for key in keys}
+        
     def set_language(self, lang):
         """设置语言"""
-        if lang in self.LANGUAGES:
+        if lang in self.SUPPORTED_LANGUAGES:
             self.current_language = lang
+            self._table = self._load_table(lang)
             return True
         return False
     
     def get_available_languages(self):
         """获取可用语言列表"""
-        return {
-            'zh_CN': '中文',
-            'en_US': 'English'
-        }
+        return self.AVAILABLE_LANGUAGES